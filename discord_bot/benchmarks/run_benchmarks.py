@@ -0,0 +1,286 @@
+"""
+Offline latency, allocation and throughput benchmarks for the market data commands.
+
+Runs the cog commands against a fake Discord context with yfinance and the
+Alpha Vantage endpoint replaced by the stubs in stubs.py, so nothing touches
+the network. Run from the discord_bot directory:
+
+    python benchmarks/run_benchmarks.py [--latency 0.05] [--iterations 50] [--json out.json]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource  # Unix only; used for the peak RSS check
+except ImportError:
+    resource = None
+
+# Add the discord_bot and repository directories to the Python path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+sys.path.append(str(pathlib.Path(__file__).parent.parent.parent))
+
+from benchmarks import stubs
+
+# Must happen before any cog or utils module imports yfinance or requests
+stubs.install()
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from cogs.economy import Economy
+from cogs.stock import Stock
+from utils.bar_store import BarStore
+from utils.chart_renderer import render_fib_chart
+from utils.indicator_state import IndicatorState
+from utils.indicators import PricePanel, compute_indicators
+
+class FakeAuthor:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+
+class FakeContext:
+    """Stands in for a discord.py Context, recording what the command sends"""
+    def __init__(self, user_id=1):
+        self.author = FakeAuthor(user_id)
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append(content if content is not None else kwargs)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+async def measure(name, command, iterations, setup=None, alloc_iterations=5):
+    """Time a command sequentially, then measure its peak allocations in a separate traced pass"""
+    latencies = []
+    stubs.reset_calls()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        await command()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    upstream_calls = sum(stubs.calls.values())
+
+    # tracemalloc slows everything down, so it gets its own pass
+    peaks = []
+    tracemalloc.start()
+    for _ in range(alloc_iterations):
+        if setup:
+            setup()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        await command()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    return {
+        'name': name,
+        'iterations': iterations,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'ops_per_sec': iterations / elapsed if elapsed else float('inf'),
+        'alloc_peak_kb': sum(peaks) / len(peaks) / 1024,
+        'upstream_calls_per_op': upstream_calls / iterations,
+    }
+
+async def measure_throughput(name, command, total, concurrency, setup=None):
+    """Run many commands concurrently and report completed commands per second"""
+    if setup:
+        setup()
+    stubs.reset_calls()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            t0 = time.perf_counter()
+            await command(i)
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+    return {
+        'name': name,
+        'iterations': total,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': sum(latencies) / len(latencies) * 1000,
+        'ops_per_sec': total / elapsed if elapsed else float('inf'),
+        'alloc_peak_kb': float('nan'),
+        'upstream_calls_per_op': sum(stubs.calls.values()) / total,
+    }
+
+async def run(args, workdir):
+    stubs.set_latency(args.latency)
+    ctx = FakeContext()
+    results = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stock = Stock(None)
+        economy = Economy(None)
+    stock.quotes.bars = BarStore(workdir / 'bars')
+    stock.quotes.names_path = workdir / 'company_names.json'
+    if not args.throttle:
+        stock.cache.min_delay = 0
+        economy.calendar_cache.min_delay = 0
+
+    def cold_quotes():
+        stock.cache.clear()
+        stock.quotes.snapshot_time = 0.0
+
+    tickers = list(stubs.QUOTE_INFO)
+    n = args.iterations
+
+    results.append(await measure("!price (cold)", lambda: stock.price.callback(stock, ctx, 'AAPL'), n, cold_quotes))
+    results.append(await measure("!price (cached)", lambda: stock.price.callback(stock, ctx, 'AAPL'), n))
+    results.append(await measure(f"!price x{len(tickers)} (cold)",
+                                 lambda: stock.price.callback(stock, ctx, *tickers), n, cold_quotes))
+    results.append(await measure("!summary (cold)", lambda: stock.summary.callback(stock, ctx, 'MSFT'), n, cold_quotes))
+    results.append(await measure("!summary (cached)", lambda: stock.summary.callback(stock, ctx, 'MSFT'), n))
+
+    fresh_stores = iter(range(10 ** 9))
+    def cold_history():
+        stock.cache.clear()
+        stock.quotes.bars = BarStore(workdir / f'bars_{next(fresh_stores)}')
+    results.append(await measure("!history 30 (upstream)", lambda: stock.history.callback(stock, ctx, 'NVDA', 30),
+                                 n, cold_history))
+    stock.quotes.bars = BarStore(workdir / 'bars')
+    results.append(await measure("!history 30 (bar store)", lambda: stock.history.callback(stock, ctx, 'NVDA', 30),
+                                 n, stock.cache.clear))
+    results.append(await measure("!history 7 (cached)", lambda: stock.history.callback(stock, ctx, 'NVDA', 7), n))
+
+    results.append(await measure("!earnings (cold)", lambda: economy.earnings.callback(economy, ctx, 'month'),
+                                 n, economy.calendar_cache.clear))
+    results.append(await measure("!earnings (cached)", lambda: economy.earnings.callback(economy, ctx, 'month'), n))
+    results.append(await measure("!econ_events month", lambda: economy.econ_events.callback(economy, ctx, 'month'), n))
+
+    results.append(await measure_throughput(
+        "!price burst, 200 cmds / 20 tickers",
+        lambda i: stock.price.callback(stock, ctx, f"T{i % 20}"),
+        total=200, concurrency=50, setup=cold_quotes
+    ))
+
+    results.extend(await run_indicator_benchmarks(sorted(stock.major_stocks), n))
+    results.extend(await run_chart_benchmarks(stock, ctx, workdir, max(n // 5, 3)))
+    stock.chart_pool.close()
+    stock.quotes.close()
+    return results
+
+async def run_indicator_benchmarks(tickers, iterations):
+    """Compare the panel indicator engine with per-ticker pandas over the whole universe"""
+    frames = {ticker: stubs.daily_bars(ticker) for ticker in tickers}
+    panel = PricePanel.from_frames(frames)
+
+    async def panel_indicators():
+        compute_indicators(panel)
+
+    async def per_ticker_indicators():
+        for df in frames.values():
+            df['Close'].rolling(10).mean()
+            df['Close'].rolling(50).mean()
+            high = df['High'].rolling(60).max()
+            low = df['Low'].rolling(60).min()
+            for level in (0.7, 0.786):
+                high - (high - low) * level
+
+    states = {ticker: IndicatorState.from_frame(df) for ticker, df in frames.items()}
+    last_bars = {ticker: df[['High', 'Low', 'Close']].iloc[-1].tolist() for ticker, df in frames.items()}
+
+    async def streaming_indicators():
+        # One new bar per ticker, as an intraday watch loop would see
+        for ticker, state in states.items():
+            state.preview(*last_bars[ticker])
+
+    return [
+        await measure(f"indicators, {len(tickers)} tickers (panel)", panel_indicators, iterations),
+        await measure(f"indicators, {len(tickers)} tickers (pandas)", per_ticker_indicators, max(iterations // 5, 3)),
+        await measure(f"indicators, {len(tickers)} tickers (streaming)", streaming_indicators, iterations),
+    ]
+
+async def run_chart_benchmarks(stock, ctx, workdir, iterations):
+    """Benchmark chart rendering; skipped if the plotting libraries aren't installed"""
+    try:
+        import chart_fib
+    except ImportError as e:
+        print(f"Skipping chart benchmarks: {e}")
+        return []
+
+    chart_fib.bar_store = BarStore(workdir / 'chart_bars')
+    bars = stubs.daily_bars('AAPL')
+
+    async def render(reuse_figure):
+        render_fib_chart(bars, 'AAPL', reuse_figure=reuse_figure)
+
+    results = [
+        await measure("render_fib_chart (mplfinance)", lambda: render(False), iterations),
+        await measure("render_fib_chart (reused figure)", lambda: render(True), iterations),
+        await measure("create_chart", lambda: asyncio.to_thread(chart_fib.create_chart, 'AAPL'), iterations),
+        await measure("!chart (cached bars)", lambda: stock.chart.callback(stock, ctx, 'AAPL'), iterations,
+                      stock.chart_cache.cache.clear),
+        await measure("!chart (cached png)", lambda: stock.chart.callback(stock, ctx, 'AAPL'), iterations),
+    ]
+    stock.chart_cache.cache.clear()
+
+    # Peak RSS shouldn't move once the reused figure has been drawn at full size
+    if resource is not None:
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        for _ in range(iterations * 100):
+            render_fib_chart(bars, 'AAPL')
+        rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        print(f"render_fib_chart: peak RSS grew {rss_growth} KB over {iterations * 100} reused-figure renders")
+
+    # Distinct users so only the pool capacity, not the per-user limit, applies
+    tickers = list(stubs.QUOTE_INFO)
+    contexts = [FakeContext(user_id) for user_id in range(iterations * 4)]
+    results.append(await measure_throughput(
+        f"!chart burst, {len(contexts)} cmds / {stock.chart_pool.max_workers} workers",
+        lambda i: stock.chart.callback(stock, contexts[i], tickers[i % len(tickers)]),
+        total=len(contexts), concurrency=len(contexts)
+    ))
+    busy = sum(1 for c in contexts for sent in c.sent if isinstance(sent, str) and 'busy' in sent)
+    print(f"!chart burst: {busy} of {len(contexts)} refused as busy")
+    return results
+
+def print_report(results, latency):
+    print(f"\nStubbed upstream latency: {latency * 1000:.0f}ms\n")
+    header = f"{'benchmark':<38} {'n':>5} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'ops/s':>9} {'alloc KB':>9} {'calls/op':>9}"
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['name']:<38} {r['iterations']:>5} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['mean_ms']:>9.2f} "
+              f"{r['ops_per_sec']:>9.1f} {r['alloc_peak_kb']:>9.1f} {r['upstream_calls_per_op']:>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the market data commands")
+    parser.add_argument('--latency', type=float, default=0.05, help="Stubbed upstream latency in seconds")
+    parser.add_argument('--iterations', type=int, default=50, help="Iterations per benchmark")
+    parser.add_argument('--throttle', action='store_true', help="Keep the real upstream throttle delays")
+    parser.add_argument('--json', help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    # Bar stores and company names are written under a scratch directory removed afterwards
+    with tempfile.TemporaryDirectory(prefix='bench_') as workdir:
+        results = asyncio.run(run(args, pathlib.Path(workdir)))
+    print_report(results, args.latency)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'latency': args.latency, 'results': results}, f, indent=4)
+
+if __name__ == "__main__":
+    main()
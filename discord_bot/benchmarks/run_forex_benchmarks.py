@@ -0,0 +1,255 @@
+"""
+Offline benchmarks for the ForexFactory calendar scraper.
+
+Parses generated calendar pages (see stubs.forex_calendar_html), or a page saved
+from the site with --page, without starting a browser, times incremental refreshes
+through ForexEventCache.update_month, and compares event name
+normalization and ForexEventCache range queries against the original implementations.
+Run from the discord_bot directory:
+
+    python benchmarks/run_forex_benchmarks.py [--iterations 20] [--page saved.html --year 2025]
+"""
+import argparse
+import pathlib
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+# Add the discord_bot directory to the Python path
+sys.path.append(str(pathlib.Path(__file__).parent.parent))
+
+from benchmarks import stubs
+from utils.forex_cache import ForexEventCache
+from utils.forex_parser import (ECONOMIC_ACRONYMS, calendar_rows, parse_calendar_html, parse_event_rows,
+                                simplify_event_name, simplify_event_names)
+
+def reference_simplify_event_name(event_name):
+    """simplify_event_name before it was compiled and memoized, kept to check the output is unchanged"""
+    # First check if the event name is already just an acronym
+    if event_name in ECONOMIC_ACRONYMS:
+        return event_name
+        
+    # Check each acronym pattern
+    for acronym, pattern in ECONOMIC_ACRONYMS.items():
+        if re.search(pattern, event_name, re.IGNORECASE):
+            # Special cases for common prefixes
+            if any(prefix in event_name.lower() for prefix in ["core ", "prelim ", "final "]):
+                prefix = next(p for p in ["Core ", "Prelim ", "Final "] 
+                            if p.lower() in event_name.lower())
+                return f"{prefix}{acronym}"
+            return acronym
+            
+    # Special case for "Speaks" events
+    if "speaks" in event_name.lower():
+        name = event_name.split(" Speaks")[0]
+        return f"{name} Speaks"
+        
+    return event_name
+
+EXTRA_TITLES = [
+    "Consumer Price Index y/y", "core consumer price index m/m", "Prelim Gross Domestic Product q/q",
+    "Federal Open Market Committee Meeting Minutes", "Manufacturing Purchasing Managers' Index",
+    "Purchasing Managers Index", "Producer Price Index m/m", "ISM Services PMI", "ISM Non-Manufacturing Index",
+    "Bank of England Rate Decision", "European Central Bank President Lagarde Speaks", "BOJ Press Conference",
+    "Bank of Canada Rate Statement", "Reserve Bank of Australia Minutes", "RBNZ Official Cash Rate",
+    "Swiss National Bank Chairman Speaks", "House Price Index y/y", "Personal Consumption Expenditure",
+    "Harmonized Index of Consumer Prices", "ADP Non-Farm Employment Change", "Final Manufacturing PMI",
+    "Non-Farm Payrolls", "Average Hourly Earnings m/m", "Empire State Manufacturing Index", "JOLTS Job Openings",
+    "Unemployment Claims", "Building Permits", "Philly Fed Manufacturing Index", "Pending Home Sales m/m",
+    "Fed Governor Waller speaks", "FOMC Member Bowman Speaks", "BOE Gov Bailey Speaks", "Bank Holiday",
+    "Natural Gas Storage", "10-y Bond Auction", "GDT Price Index", "Core Retail Sales m/m", "Final CPI y/y",
+    "Prelim UoM Inflation Expectations", "Italian Prelim CPI m/m", "German ZEW Economic Sentiment",
+    "CPI", "GDP", "PMI", "RBA", "ECB", "speaks", "Lagarde Speaks At Conference", "Core",
+]
+
+def title_corpus(size, seed=0):
+    """Event titles with the heavy repetition of real scrapes, plus case and prefix variants"""
+    rng = random.Random(seed)
+    base = stubs.FOREX_EVENTS + EXTRA_TITLES
+    variants = base + [t.upper() for t in base] + [t.lower() for t in base] + \
+        [f"{p}{t}" for p in ("Core ", "Final ", "Prelim ", "Flash ") for t in base]
+    return [rng.choice(variants) for _ in range(size)]
+
+def timed(func, iterations):
+    """Median seconds per call"""
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - t0)
+    return sorted(samples)[len(samples) // 2]
+
+def bench_parser(html, year, iterations):
+    events = parse_calendar_html(html, year)
+    count = sum(len(day) for day in events.values())
+    seconds = timed(lambda: parse_calendar_html(html, year), iterations)
+    print(f"parse_calendar_html: {len(html) / 1024:.0f} KB page, {len(events)} days, {count} events "
+          f"in {seconds * 1000:.1f} ms ({seconds / max(count, 1) * 1e6:.1f} us/event)")
+
+def edited_page(html, year):
+    """The page as a later refresh might see it: three impacts raised and the last event dropped"""
+    _, rows = calendar_rows(html, year)
+    edited = html.replace('icon--ff-impact-yel', 'icon--ff-impact-red', 3)
+    return edited.replace(rows[-1][2], '')
+
+def bench_incremental(html, year, iterations):
+    def refreshed(first, second=None):
+        cache = ForexEventCache()
+        cache.update_month('current_month', *calendar_rows(first, year), parse_event_rows)
+        if second is not None:
+            t0 = time.perf_counter()
+            changes = cache.update_month('current_month', *calendar_rows(second, year), parse_event_rows)
+            return cache, changes, time.perf_counter() - t0
+        return cache
+
+    cache = refreshed(html)
+    if cache.get_month('current_month') != parse_calendar_html(html, year):
+        raise SystemExit("update_month stored different events than parse_calendar_html")
+    edited = edited_page(html, year)
+    cache, changes, _ = refreshed(html, edited)
+    if cache.get_month('current_month') != parse_calendar_html(edited, year):
+        raise SystemExit("Incremental refresh stored different events than a full parse")
+
+    # A page cut off partway through the month must not drop the days it never reached
+    days, rows = calendar_rows(html, year)
+    cache = refreshed(html)
+    cutoff = days[len(days) // 3]
+    truncated = cache.update_month('current_month', [d for d in days if d <= cutoff],
+                                   [r for r in rows if r[1] <= cutoff][:-1], parse_event_rows, complete=False)
+    if truncated or cache.get_month('current_month') != parse_calendar_html(html, year):
+        raise SystemExit("An incomplete page changed events it didn't reach")
+
+    # At the month rollover each month moves to the next bucket, which isn't a change
+    pages = {m: stubs.forex_calendar_html(2025, m) for m in (9, 10, 11, 12)}
+    cache = ForexEventCache()
+    rollover = []
+    for buckets in ((('previous_month', 9), ('current_month', 10), ('next_month', 11)),
+                    (('previous_month', 10), ('current_month', 11), ('next_month', 12))):
+        rollover = []
+        for month_key, m in buckets:
+            rollover += cache.update_month(month_key, *calendar_rows(pages[m], 2025), parse_event_rows,
+                                           month=f"2025-{m:02d}")
+    if any(change['month'] != '2025-12' for change in rollover):
+        raise SystemExit("Shifting buckets at the month rollover was logged as changes")
+
+    counts = {}
+    for change in changes:
+        counts[change['change']] = counts.get(change['change'], 0) + 1
+    first = timed(lambda: refreshed(html), iterations)
+    unchanged = sorted(refreshed(html, html)[2] for _ in range(iterations))[iterations // 2]
+    changed = sorted(refreshed(html, edited)[2] for _ in range(iterations))[iterations // 2]
+    print(f"\nForexEventCache.update_month, results identical to a full parse")
+    print(f"  first scrape (every row parsed)    {first * 1000:>8.1f} ms")
+    print(f"  refresh, page unchanged            {unchanged * 1000:>8.1f} ms")
+    print(f"  refresh, {len(changes)} rows changed/removed   {changed * 1000:>8.1f} ms  {counts}")
+
+def bench_simplify(iterations, size=100_000):
+    corpus = title_corpus(size)
+    mismatches = {t for t in set(corpus) if simplify_event_name(t) != reference_simplify_event_name(t)}
+    if mismatches:
+        raise SystemExit(f"simplify_event_name output changed for: {sorted(mismatches)}")
+
+    def compiled_cold():
+        simplify_event_name.cache_clear()
+        simplify_event_names(corpus)
+
+    reference = timed(lambda: [reference_simplify_event_name(t) for t in corpus], max(iterations // 4, 1))
+    cold = timed(compiled_cold, max(iterations // 4, 1))
+    warm = timed(lambda: simplify_event_names(corpus), iterations)
+    print(f"\nsimplify_event_name: {size} titles ({len(set(corpus))} distinct), output identical to the old function")
+    print(f"  old per-pattern re.search   {reference * 1000:>8.1f} ms")
+    print(f"  compiled, empty memo        {cold * 1000:>8.1f} ms")
+    print(f"  compiled, warm memo         {warm * 1000:>8.1f} ms")
+
+    distinct = sorted(set(corpus))
+    reference = timed(lambda: [reference_simplify_event_name(t) for t in distinct], iterations)
+    uncached = timed(lambda: [simplify_event_name.__wrapped__(t) for t in distinct], iterations)
+    print(f"  per distinct title, no memo: old {reference / len(distinct) * 1e6:.1f} us, "
+          f"compiled {uncached / len(distinct) * 1e6:.1f} us")
+
+def reference_events_in_range(cache, start_date, end_date, currency=None, importance=None):
+    """ForexEventCache.get_events_in_range before the index: one bucket scan per calendar day"""
+    def events_for_date(date_str):
+        for month_events in cache._monthly_events.values():
+            if date_str in month_events:
+                return month_events[date_str]
+        return []
+
+    events = {}
+    current_date = start_date
+    while current_date <= end_date:
+        date_str = current_date.strftime('%Y-%m-%d')
+        day_events = events_for_date(date_str)
+        if currency:
+            day_events = [e for e in day_events if e['currency'] == currency]
+        if importance:
+            day_events = [e for e in day_events if e['importance'] in importance]
+        if day_events:
+            events[date_str] = day_events
+        current_date += timedelta(days=1)
+    return events
+
+def month_events(year, month, events_per_day=12, seed=0):
+    """Parsed-calendar shaped events for a month, without generating and parsing a page"""
+    rng = random.Random(year * 100 + month + seed)
+    importances = ["High", "Medium", "Low", "Non-Economic"]
+    day = date(year, month, 1)
+    events = {}
+    while day.month == month:
+        events[day.isoformat()] = [{
+            'time': f"{rng.randint(1, 12)}:{rng.choice(['00', '30'])}am",
+            'currency': rng.choice(stubs.FOREX_CURRENCIES),
+            'event': rng.choice(stubs.FOREX_EVENTS),
+            'importance': rng.choice(importances),
+        } for _ in range(events_per_day)]
+        day += timedelta(days=1)
+    return events
+
+def bench_range_queries(iterations, years=3):
+    cache = ForexEventCache()
+    first = date(date.today().year - years + 1, 1, 1)
+    for offset in range(12 * years):
+        year, month = first.year + offset // 12, offset % 12 + 1
+        cache.store_month(f"{year}-{month:02d}", month_events(year, month))
+    last = date(first.year + years - 1, 12, 31)
+    quarter = (date(last.year, 10, 1), last)
+
+    queries = [
+        ("week, all events", (last - timedelta(days=6), last), {}),
+        ("quarter, High USD", quarter, {'currency': 'USD', 'importance': ['High']}),
+        ("quarter, High/Medium", quarter, {'importance': ['High', 'Medium']}),
+        (f"{years} years, High USD", (first, last), {'currency': 'USD', 'importance': ['High']}),
+        (f"{years} years, JPY", (first, last), {'currency': 'JPY'}),
+    ]
+    print(f"\nForexEventCache.get_events_in_range: {len(cache._events)} events over {years} years")
+    for label, (start, end), filters in queries:
+        expected = reference_events_in_range(cache, start, end, **filters)
+        if cache.get_events_in_range(start, end, **filters) != expected:
+            raise SystemExit(f"get_events_in_range results changed for: {label}")
+        reference = timed(lambda: reference_events_in_range(cache, start, end, **filters), iterations)
+        indexed = timed(lambda: cache.get_events_in_range(start, end, **filters), iterations)
+        results = sum(len(day) for day in expected.values())
+        print(f"  {label:<24} {results:>6} results  per-day scan {reference * 1000:>8.2f} ms  "
+              f"indexed {indexed * 1000:>7.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the ForexFactory scraper")
+    parser.add_argument('--iterations', type=int, default=20, help="Iterations per benchmark")
+    parser.add_argument('--page', help="Saved calendar page to parse instead of a generated one")
+    parser.add_argument('--year', type=int, default=date.today().year, help="Year of the saved page")
+    args = parser.parse_args()
+
+    if args.page:
+        page, year = pathlib.Path(args.page).read_text(encoding='utf-8'), args.year
+    else:
+        year = date.today().year
+        page = stubs.forex_calendar_html(year, date.today().month)
+    bench_parser(page, year, args.iterations)
+    bench_incremental(page, year, args.iterations)
+    bench_simplify(args.iterations)
+    bench_range_queries(args.iterations)
+
+if __name__ == "__main__":
+    main()
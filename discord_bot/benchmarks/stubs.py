@@ -0,0 +1,218 @@
+"""
+Offline stand-ins for yfinance and the Alpha Vantage CSV endpoint, plus a
+generator for ForexFactory calendar pages.
+
+install() registers stub 'yfinance' and 'requests' modules in sys.modules, so it
+must run before any cog or utils module is imported. Each upstream call sleeps for
+the configured latency, then answers from the recorded fixtures in fixtures/ or,
+for daily bars, from a deterministic random walk per ticker.
+"""
+import calendar
+import csv
+import functools
+import json
+import pathlib
+import sys
+import time
+import types
+import zlib
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+FIXTURES = pathlib.Path(__file__).parent / 'fixtures'
+
+# Seconds each stubbed upstream call takes; set with set_latency()
+_latency = 0.0
+# Number of upstream calls made, per kind, so benchmarks can report fan-out
+calls = {'info': 0, 'history': 0, 'download': 0, 'http': 0}
+
+def set_latency(seconds):
+    global _latency
+    _latency = seconds
+
+def reset_calls():
+    for kind in calls:
+        calls[kind] = 0
+
+def _upstream(kind):
+    calls[kind] += 1
+    if _latency:
+        time.sleep(_latency)
+
+def _load_quote_info():
+    with open(FIXTURES / 'quote_info.json', 'r') as f:
+        return json.load(f)
+
+QUOTE_INFO = _load_quote_info()
+
+@functools.lru_cache(maxsize=None)
+def _full_series(ticker):
+    """Deterministic business-day bars for a ticker from 2015 to today, closing at its fixture price"""
+    index = pd.bdate_range('2015-01-01', date.today(), tz='America/New_York', name='Date')
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    steps = rng.normal(0, 0.015, len(index))
+    base = QUOTE_INFO.get(ticker, {}).get('regularMarketPrice', 100.0)
+    close = base * np.exp(np.cumsum(steps) - steps.sum())
+    spread = np.abs(rng.normal(0, 0.01, len(index))) * close
+    return pd.DataFrame({
+        'Open': close - spread / 2,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 50_000_000, len(index)).astype(float),
+    }, index=index)
+
+def _timestamp(value):
+    value = pd.Timestamp(value)
+    return value.tz_localize('America/New_York') if value.tz is None else value
+
+def daily_bars(ticker, start=None, end=None):
+    """Deterministic daily bars for a ticker over business days in [start, end)"""
+    bars = _full_series(ticker.upper())
+    end = _timestamp(end or date.today() + timedelta(days=1))
+    start = _timestamp(start or end - timedelta(days=365))
+    return bars[(bars.index >= start) & (bars.index < end)].copy()
+
+class Ticker:
+    def __init__(self, ticker):
+        self.ticker = ticker.upper()
+
+    @property
+    def info(self):
+        _upstream('info')
+        info = dict(QUOTE_INFO.get(self.ticker) or {
+            'shortName': f"{self.ticker} Corp",
+            'regularMarketPrice': 100.0,
+            'dayHigh': 101.0,
+            'dayLow': 99.0,
+            'volume': 1_000_000,
+        })
+        info['longName'] = info['shortName']
+        return info
+
+    @property
+    def calendar(self):
+        _upstream('info')
+        return pd.DataFrame()
+
+    def history(self, period=None, start=None, end=None, interval='1d', **kwargs):
+        _upstream('history')
+        if period:
+            end = date.today() + timedelta(days=1)
+            start = end - timedelta(days=int(period.rstrip('d')))
+        return daily_bars(self.ticker, start, end)
+
+def download(tickers, period='5d', interval='1d', group_by='column', **kwargs):
+    _upstream('download')
+    if isinstance(tickers, str):
+        tickers = tickers.split()
+    days = int(period.rstrip('d'))
+    end = date.today() + timedelta(days=1)
+    frames = {ticker.upper(): daily_bars(ticker, end - timedelta(days=days), end) for ticker in tickers}
+    data = pd.concat(frames, axis=1)  # (ticker, field) columns
+    return data.swaplevel(axis=1).sort_index(axis=1)  # (field, ticker), like group_by='column'
+
+class HTTPError(Exception):
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+class Response:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code != 200:
+            raise HTTPError(f"{self.status_code} Error", response=self)
+
+def earnings_calendar_csv():
+    """The recorded earnings calendar, shifted so its first report date is today"""
+    with open(FIXTURES / 'earnings_calendar.csv', 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    first = min(datetime.strptime(row['reportDate'], '%Y-%m-%d').date() for row in rows)
+    shift = date.today() - first
+    out = StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    for row in rows:
+        row['reportDate'] = (datetime.strptime(row['reportDate'], '%Y-%m-%d').date() + shift).isoformat()
+        writer.writerow(row)
+    return out.getvalue()
+
+def get(url, timeout=None, **kwargs):
+    _upstream('http')
+    if 'EARNINGS_CALENDAR' in url:
+        return Response(earnings_calendar_csv())
+    return Response('', status_code=404)
+
+FOREX_EVENTS = [
+    "Core CPI m/m", "CPI y/y", "Non-Farm Employment Change", "Unemployment Rate", "FOMC Statement",
+    "Fed Chair Powell Speaks", "ECB Press Conference", "German Prelim GDP q/q", "ISM Manufacturing PMI",
+    "Retail Sales m/m", "Crude Oil Inventories", "BOJ Policy Rate", "Flash Manufacturing PMI",
+    "Final GDP q/q", "PPI m/m", "Core PCE Price Index m/m", "ADP Non-Farm Employment Change",
+    "Bank Holiday", "HPI m/m", "Trade Balance", "Prelim UoM Consumer Sentiment", "RBA Rate Statement",
+]
+FOREX_CURRENCIES = ["USD", "EUR", "GBP", "JPY", "AUD", "CAD", "CHF", "NZD", "CNY"]
+FOREX_IMPACTS = ["ff-impact-red", "ff-impact-ora", "ff-impact-yel", "ff-impact-gra"]
+
+def forex_calendar_html(year, month, events_per_day=12):
+    """
+    A deterministic ForexFactory month page with the calendar table markup the scraper parses
+
+    Rows follow the site's layout: a day-breaker row per day, then event rows with
+    data-event-id, where only the first event at each time shows the time.
+    """
+    rng = np.random.default_rng(year * 100 + month)
+    rows = []
+    event_id = year * 10 ** 6 + month * 10 ** 4
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        day_date = date(year, month, day)
+        rows.append(
+            '<tr class="calendar__row calendar__row--day-breaker" data-day-dateline="0">'
+            f'<td class="calendar__cell" colspan="10"><span>{day_date:%a} <span>{day_date:%b} {day}</span></span></td></tr>'
+        )
+        previous_time = None
+        for i in range(events_per_day):
+            event_id += 1
+            minutes = int(rng.integers(0, 48)) * 30 if i else 0
+            event_time = f"{(minutes // 60) % 12 or 12}:{minutes % 60:02d}{'am' if minutes < 720 else 'pm'}"
+            shown_time = "" if event_time == previous_time else f"<div>{event_time}</div>"
+            previous_time = event_time
+            name = FOREX_EVENTS[int(rng.integers(len(FOREX_EVENTS)))]
+            rows.append(
+                f'<tr class="calendar__row" data-event-id="{event_id}" data-touchable="">'
+                f'<td class="calendar__cell calendar__date"></td>'
+                f'<td class="calendar__cell calendar__time">{shown_time}</td>'
+                f'<td class="calendar__cell calendar__currency">{FOREX_CURRENCIES[int(rng.integers(len(FOREX_CURRENCIES)))]}</td>'
+                f'<td class="calendar__cell calendar__impact"><span title="Impact" '
+                f'class="icon icon--{FOREX_IMPACTS[int(rng.integers(len(FOREX_IMPACTS)))]}"></span></td>'
+                f'<td class="calendar__cell calendar__event event"><div class="calendar__event-title">{name}</div></td>'
+                f'<td class="calendar__cell calendar__detail"><a class="calendar__detail-link" title="Open Detail"></a></td>'
+                f'<td class="calendar__cell calendar__actual"></td>'
+                f'<td class="calendar__cell calendar__forecast"><span>0.{i}%</span></td>'
+                f'<td class="calendar__cell calendar__previous"><span>0.{i + 1}%</span></td></tr>'
+            )
+    # Surrounding page chrome, which the parser should skip
+    chrome = '<div class="flexposts"><ul>' + '<li><a href="#">Headline</a></li>' * 500 + '</ul></div>'
+    return (
+        '<html><head><title>Forex Factory</title></head><body>' + chrome +
+        '<table class="calendar__table"><thead><tr><th>Date</th></tr></thead><tbody>' +
+        ''.join(rows) + '</tbody></table>' + chrome + '</body></html>'
+    )
+
+def install():
+    """Register the stub yfinance and requests modules"""
+    yfinance = types.ModuleType('yfinance')
+    yfinance.Ticker = Ticker
+    yfinance.download = download
+    sys.modules['yfinance'] = yfinance
+
+    requests = types.ModuleType('requests')
+    requests.get = get
+    requests.HTTPError = HTTPError
+    requests.Response = Response
+    sys.modules['requests'] = requests
@@ -1,5 +1,8 @@
 from discord.ext import commands
 import discord
+from utils.cache_stats import registered_caches
+import utils.forex_cache  # noqa: F401  # Registers the shared forex event cache for !cachestats
+from utils.helpers import format_bytes
 
 class Admin(commands.Cog):
     def __init__(self, bot):
@@ -17,5 +20,49 @@ class Admin(commands.Cog):
         if isinstance(error, commands.MissingPermissions):
             await ctx.send("You don't have permission to do that!")
 
+    @commands.command()
+    @commands.has_permissions(administrator=True)
+    async def cachestats(self, ctx):
+        """Show hit/miss, size and fetch latency metrics for each cache"""
+        caches = registered_caches()
+        if not caches:
+            await ctx.send("No caches are registered yet.")
+            return
+
+        embed = discord.Embed(
+            title="Cache Statistics",
+            color=0x808080
+        )
+
+        for name, cache in sorted(caches.items()):
+            stats = cache.get_stats()
+            lines = [
+                f"**{stats['entries']} entries, {format_bytes(stats['bytes'])}, "
+                f"throttled {stats['throttle_wait']:.1f}s total**"
+            ]
+            for family, counters in sorted(stats['families'].items()):
+                served = counters['hits'] + counters['stale_hits']
+                lookups = served + counters['misses']
+                lines.append(
+                    f"`{family}`: {served:.0f}/{lookups:.0f} hits ({counters['hit_rate']:.0%}), "
+                    f"{counters['stale_hits']:.0f} of them stale, {counters['entries']} entries, "
+                    f"{format_bytes(counters['bytes'])}, {counters['evictions']:.0f} evicted, "
+                    f"{counters['expirations']:.0f} expired, {counters['loads']:.0f} loads "
+                    f"({counters['load_errors']:.0f} failed, avg {counters['load_time_avg'] * 1000:.0f}ms, "
+                    f"max {counters['load_time_max'] * 1000:.0f}ms)"
+                )
+            embed.add_field(
+                name=name,
+                value="\n".join(lines)[:1024],
+                inline=False
+            )
+
+        await ctx.send(embed=embed)
+
+    @cachestats.error
+    async def cachestats_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("You don't have permission to do that!")
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
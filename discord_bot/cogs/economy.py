@@ -1,6 +1,5 @@
 from discord.ext import commands
 import discord
-import requests
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
@@ -9,6 +8,9 @@ from io import StringIO
 import json
 import glob
 import pathlib
+import asyncio
+from utils.rate_limiting import RateLimitedCache
+from utils.cache_stats import register_cache
 
 class Economy(commands.Cog):
     def __init__(self, bot):
@@ -16,11 +18,16 @@ class Economy(commands.Cog):
         load_dotenv()
         self.api_key = os.getenv('ALPHA_VANTAGE_API_KEY')
         self.base_url = 'https://www.alphavantage.co/query'
+        # 1 hour cache for the earnings calendar, served stale for up to 12 more hours while it refreshes
+        self.calendar_cache = RateLimitedCache(cache_ttl=3600, min_delay=1.0, max_entries=8, max_stale=12 * 3600)
+        register_cache("earnings_calendar", self.calendar_cache)
         
         # Get the path relative to this file
         current_dir = pathlib.Path(__file__).parent.parent
         self.events_directory = current_dir / 'data'
         self.economic_events = {}
+        self._events_task = None
+        self._warmup = None
         
         # Pre-compiled list of major index components
         self.sp500_stocks = {
@@ -77,7 +84,23 @@ class Economy(commands.Cog):
         # Combine all indices
         self.major_stocks = self.sp500_stocks | self.nasdaq100_additional | self.dow30_additional
 
-        self.load_events()
+    async def cog_load(self):
+        # Read the event files after login instead of while the cogs are loading
+        self._warmup = asyncio.create_task(self._warm_up())
+
+    async def cog_unload(self):
+        if self._warmup:
+            self._warmup.cancel()
+
+    async def _warm_up(self):
+        await self.bot.wait_until_ready()
+        await self.ensure_events_loaded()
+
+    async def ensure_events_loaded(self):
+        """Load the economic events in a worker thread the first time they're needed"""
+        if self._events_task is None:
+            self._events_task = asyncio.ensure_future(asyncio.to_thread(self.load_events))
+        await asyncio.shield(self._events_task)
 
     def load_events(self):
         """Load economic events from all monthly JSON files"""
@@ -96,18 +119,17 @@ class Economy(commands.Cog):
                     print(f"Directory contents: {os.listdir(self.events_directory)}")
                 return
             
-            # Clear existing events
-            self.economic_events = {}
-            
-            # Load and combine all JSON files
+            # Load and combine all JSON files, then swap them in at once
+            events = {}
             for file_path in json_files:
                 try:
                     print(f"Loading file: {file_path}")
                     with open(file_path, 'r') as f:
                         month_events = json.load(f)
-                        self.economic_events.update(month_events)
+                        events.update(month_events)
                 except Exception as e:
                     print(f"Error loading {file_path}: {str(e)}")
+            self.economic_events = events
             
             if not self.economic_events:
                 print("No events loaded from JSON files")
@@ -120,10 +142,23 @@ class Economy(commands.Cog):
             print(traceback.format_exc())
             self.economic_events = {}
 
+    def _fetch_earnings_calendar(self):
+        """Blocking download of the 3-month earnings calendar CSV"""
+        import requests
+        url = f'{self.base_url}?function=EARNINGS_CALENDAR&horizon=3month&apikey={self.api_key}'
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        return list(csv.DictReader(StringIO(response.text)))
+
+    async def _load_earnings_calendar(self):
+        await self.calendar_cache.throttle_async()
+        return await asyncio.to_thread(self._fetch_earnings_calendar)
+
     @commands.command()
     async def debug_events(self, ctx):
         """Debug command to check events loading status"""
         try:
+            await self.ensure_events_loaded()
             embed = discord.Embed(
                 title="Events Debug Information",
                 color=0x808080
@@ -167,6 +202,7 @@ class Economy(commands.Cog):
         """Show economic events for day/week/month
         Usage: !econ_events [day|week|month]"""
         try:
+            await self.ensure_events_loaded()
             today = datetime.now().date()
             
             if timeframe.lower() == "day":
@@ -219,6 +255,7 @@ class Economy(commands.Cog):
     async def earnings(self, ctx, timeframe: str = "week"):
         """Get earnings calendar events for day/week/month
         Usage: !earnings [day|week|month]"""
+        import requests
         try:
             today = datetime.now().date()
             
@@ -232,16 +269,14 @@ class Economy(commands.Cog):
                 days = 7
                 title = "Earnings Calendar - Next 7 Days"
 
-            url = f'{self.base_url}?function=EARNINGS_CALENDAR&horizon=3month&apikey={self.api_key}'
-            
-            response = requests.get(url)
-            if response.status_code != 200:
-                await ctx.send(f"Error fetching data: {response.status_code}")
+            try:
+                events = await self.calendar_cache.get_or_load(
+                    "calendar:earnings", self._load_earnings_calendar, stale_while_revalidate=True
+                )
+            except requests.HTTPError as e:
+                await ctx.send(f"Error fetching data: {e.response.status_code}")
                 return
-
-            csv_data = StringIO(response.text)
-            reader = csv.DictReader(csv_data)
-            events = list(reader)
+            calendar_age = self.calendar_cache.age("calendar:earnings") or 0
 
             today = datetime.now().date()
             end_date = today + timedelta(days=days)
@@ -294,6 +329,9 @@ class Economy(commands.Cog):
                         inline=False
                     )
 
+            if calendar_age >= self.calendar_cache.cache_ttl:
+                current_embed.set_footer(text=f"Calendar data as of {int(calendar_age // 60)} min ago, refreshing")
+
             await ctx.send(embed=current_embed)
 
         except Exception as e:
@@ -1,12 +1,16 @@
 from discord.ext import commands, tasks
 import discord
 from datetime import datetime, timedelta
-import yfinance as yf
 from typing import List, Dict
 import asyncio
 import os
 import pandas as pd
 
+from utils.chart_gallery import build_gallery
+
+# Tickers whose earnings and charts are included in the reports
+WATCHLIST = ["AAPL", "MSFT", "GOOGL", "AMZN", "META"]
+
 class Reports(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -27,11 +31,8 @@ class Reports(commands.Cog):
             
         earnings_list = []
         try:
-            # You might want to maintain a list of stocks you're interested in
-            # For now, we'll use some example tickers
-            tickers = ["AAPL", "MSFT", "GOOGL", "AMZN", "META"]  # Add your desired tickers
-            
-            for ticker in tickers:
+            import yfinance as yf
+            for ticker in WATCHLIST:
                 try:
                     stock = yf.Ticker(ticker)
                     calendar = stock.calendar
@@ -52,6 +53,21 @@ class Reports(commands.Cog):
             
         return earnings_list
 
+    def gallery_tickers(self, earnings: List[Dict]) -> List[str]:
+        """Tickers charted in a report: the watchlist plus the names reporting earnings"""
+        return sorted(set(WATCHLIST) | {e['ticker'] for e in earnings})
+
+    async def prepare_chart_gallery(self, earnings: List[Dict]) -> Dict:
+        """
+        Get today's chart images, rendering any that weren't prebuilt
+        by scripts/build_chart_gallery.py
+        """
+        try:
+            return await asyncio.to_thread(build_gallery, self.gallery_tickers(earnings))
+        except Exception as e:
+            print(f"Error building chart gallery: {e}")
+            return {}
+
     async def generate_report(self, is_weekly: bool = False):
         """Generate and send the market report to the configured channel"""
         if not self.channel_id:
@@ -89,6 +105,14 @@ class Reports(commands.Cog):
         
         await channel.send(embed=earnings_embed)
         
+        # Attach the chart gallery, up to 10 images per message
+        gallery = await self.prepare_chart_gallery(earnings)
+        if gallery:
+            await channel.send("\n📈 Fibonacci charts for the watchlist and earnings names:")
+            paths = list(gallery.values())
+            for i in range(0, len(paths), 10):
+                await channel.send(files=[discord.File(path) for path in paths[i:i + 10]])
+        
         # Add economic events section
         econ_header = f"\n🗓️ Here's the economic news for the {'week' if is_weekly else 'day'}:\n"
         await channel.send(econ_header)
@@ -1,14 +1,37 @@
-from discord.ext import commands
-import yfinance as yf
+from discord.ext import commands, tasks
 import discord
-from datetime import datetime, timedelta
-import pandas as pd
+from datetime import datetime, timedelta, time as dt_time
+from collections import Counter
+import io
+import time
+from zoneinfo import ZoneInfo
 from utils.rate_limiting import RateLimitedCache
+from utils.quote_service import QuoteService
+from utils.cache_stats import register_cache
+from utils.chart_pool import ChartRenderPool, ChartQueueFull, ChartUserLimit
+from utils.chart_cache import ChartCache
+
+MARKET_TZ = ZoneInfo('America/New_York')
+# Start warming a few minutes early so the opening bell hits a warm cache
+PREWARM_START = dt_time(9, 25)
+MARKET_CLOSE = dt_time(16, 0)
 
 class Stock(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cache = RateLimitedCache(cache_ttl=300, min_delay=2.0)  # 5 min cache, 2s delay
+        # 5 min cache, 2s delay, at most 512 entries / 32MB, stale quotes served for up to 15 more min
+        self.cache = RateLimitedCache(cache_ttl=300, min_delay=2.0, max_entries=512,
+                                      max_bytes=32 * 1024 * 1024, max_stale=900)
+        register_cache("stock", self.cache)
+        self.quotes = QuoteService(self.cache, max_workers=4)
+        self.chart_pool = ChartRenderPool(max_queue=16, max_per_user=2)
+        self.chart_cache = ChartCache(max_entries=256, max_bytes=32 * 1024 * 1024)
+        register_cache("charts", self.chart_cache)
+
+        # Decaying per-ticker request counts used to pick which quotes to keep warm
+        self.request_counts = Counter()
+        self.prewarm_budget = 10  # Single-quote refreshes per minute, ~1/3 of the 2s throttle
+        self.prewarm_lead = 90  # Refresh this many seconds before a quote would expire
         
         # Pre-compiled list of major index components
         self.sp500_stocks = {
@@ -65,43 +88,108 @@ class Stock(commands.Cog):
         # Combine all indices
         self.major_stocks = self.sp500_stocks | self.nasdaq100_additional | self.dow30_additional
 
-    def _get_stock_info(self, ticker):
+    async def cog_load(self):
+        self.cache.start_sweeper(interval=60)
+        self.prewarm_quotes.start()
+
+    async def cog_unload(self):
+        self.prewarm_quotes.cancel()
+        self.cache.stop_sweeper()
+        self.quotes.close()
+        self.chart_pool.close()
+
+    @staticmethod
+    def _market_is_open(now=None):
+        """Whether US markets are open (or about to open) on a weekday"""
+        now = now or datetime.now(MARKET_TZ)
+        return now.weekday() < 5 and PREWARM_START <= now.time() < MARKET_CLOSE
+
+    def _record_request(self, ticker):
+        self.request_counts[ticker.upper()] += 1
+
+    @tasks.loop(seconds=60)
+    async def prewarm_quotes(self):
+        """Keep the universe snapshot and the most requested quotes warm during market hours"""
+        market_open = self._market_is_open()
+        refresh_after = self.cache.cache_ttl - self.prewarm_lead if market_open else self.cache.cache_ttl
+
+        # The whole index universe costs a single bulk download
+        if time.time() - self.quotes.snapshot_time >= refresh_after:
+            try:
+                snapshot = await self.quotes.refresh_snapshot(self.major_stocks)
+                print(f"Refreshed universe snapshot: {len(snapshot)} tickers")
+            except Exception as e:
+                print(f"Error refreshing universe snapshot: {str(e)}")
+
+        if market_open:
+            budget = self.prewarm_budget
+            for ticker, _ in self.request_counts.most_common():
+                if budget <= 0:
+                    break
+                if ticker in self.quotes.snapshot.index:
+                    continue
+                age = self.cache.age(f"quote:{ticker}")
+                if age is not None and age < refresh_after:
+                    continue
+                await self.quotes.refresh_quote(ticker)
+                budget -= 1
+
+        # Decay counts (half-life ~14 minutes) so the warm set follows recent demand
+        self.request_counts = Counter({
+            ticker: count * 0.95
+            for ticker, count in self.request_counts.items()
+            if count * 0.95 >= 0.5
+        })
+
+    @prewarm_quotes.before_loop
+    async def before_prewarm_quotes(self):
+        await self.bot.wait_until_ready()
+
+    async def _get_stock_info(self, ticker):
         """Get stock info with caching and rate limiting"""
-        # Check cache first
-        cached_info = self.cache.get(ticker)
-        if cached_info is not None:
-            return cached_info
+        return await self.quotes.get_quote(ticker)
 
-        # If not in cache or expired, fetch new data
-        stock = yf.Ticker(ticker)
-        try:
-            info = {
-                'price': stock.info.get('regularMarketPrice'),
-                'high': stock.info.get('dayHigh'),
-                'low': stock.info.get('dayLow'),
-                'volume': stock.info.get('volume'),
-                'name': stock.info.get('shortName', ticker.upper())
-            }
-            # Store in cache
-            self.cache.set(ticker, info)
-            return info
-        except Exception as e:
-            print(f"Error fetching {ticker}: {str(e)}")
-            return None
+    def _stale_label(self, ticker):
+        """Note how old a quote is when a stale one is served while it refreshes"""
+        age = self.quotes.quote_age(ticker)
+        if age is None or age < self.cache.cache_ttl:
+            return ""
+        return f" (as of {int(age // 60)} min ago)"
 
     @commands.command()
-    async def price(self, ctx, ticker: str):
-        """Get current price of a stock
-        Usage: !price AAPL"""
+    async def price(self, ctx, *tickers: str):
+        """Get current price of one or more stocks
+        Usage: !price AAPL or !price AAPL MSFT NVDA"""
+        if not tickers:
+            await ctx.send("Please provide at least one ticker, e.g. !price AAPL")
+            return
+        if len(tickers) > 25:
+            await ctx.send("Please request 25 tickers or fewer!")
+            return
+
         try:
-            info = self._get_stock_info(ticker)
-            if not info or not info['price']:
-                await ctx.send(f"Unable to get price data for {ticker}. Please try again later.")
+            if len(tickers) == 1:
+                ticker = tickers[0]
+                info = await self._get_stock_info(ticker)
+                if not info or not info['price']:
+                    await ctx.send(f"Unable to get price data for {ticker}. Please try again later.")
+                    return
+
+                self._record_request(ticker)
+                await ctx.send(f"💰 {info['name']}: ${info['price']:.2f}{self._stale_label(ticker)}")
                 return
-                
-            await ctx.send(f"💰 {info['name']}: ${info['price']:.2f}")
+
+            quotes = await self.quotes.get_quotes(tickers)
+            lines = []
+            for ticker, info in quotes.items():
+                if not info or not info['price']:
+                    lines.append(f"⚠️ {ticker}: unavailable")
+                else:
+                    self._record_request(ticker)
+                    lines.append(f"💰 {info['name']}: ${info['price']:.2f}")
+            await ctx.send("\n".join(lines))
         except Exception as e:
-            await ctx.send(f"Error getting price for {ticker}: {str(e)}")
+            await ctx.send(f"Error getting price for {', '.join(tickers)}: {str(e)}")
             import traceback
             print(traceback.format_exc())
 
@@ -110,15 +198,19 @@ class Stock(commands.Cog):
         """Get a quick summary of a stock
         Usage: !summary AAPL"""
         try:
-            info = self._get_stock_info(ticker)
+            info = await self._get_stock_info(ticker)
             if not info or not info['price']:
                 await ctx.send(f"Unable to get data for {ticker}. Please try again later.")
                 return
             
+            self._record_request(ticker)
             embed = discord.Embed(
                 title=f"{info['name']} ({ticker.upper()}) Summary", 
                 color=0x808080
             )
+            stale_label = self._stale_label(ticker)
+            if stale_label:
+                embed.set_footer(text=f"Quote{stale_label}, refreshing")
             
             embed.add_field(
                 name="Current Price", 
@@ -160,16 +252,7 @@ class Stock(commands.Cog):
                 await ctx.send("Please request 30 days or fewer!")
                 return
             
-            # Use a different cache key for historical data
-            cache_key = f"{ticker}_history_{days}"
-            cached_hist = self.cache.get(cache_key)
-            
-            if cached_hist is not None:
-                hist = cached_hist
-            else:
-                stock = yf.Ticker(ticker)
-                hist = stock.history(period=f"{days}d")
-                self.cache.set(cache_key, hist)
+            hist = await self.quotes.get_history(ticker, days)
             
             if hist.empty:
                 await ctx.send(f"No historical data available for {ticker}")
@@ -206,6 +289,34 @@ class Stock(commands.Cog):
             import traceback
             print(traceback.format_exc())
 
+    @commands.command()
+    async def chart(self, ctx, ticker: str):
+        """Get a 60-day candlestick chart with Fibonacci levels
+        Usage: !chart AAPL"""
+        try:
+            # 250 calendar days covers the 50-day SMA warmup plus the 60-bar window
+            hist = await self.quotes.get_history(ticker, 250)
+            png = self.chart_cache.get(ticker, hist)
+            if png is None:
+                with self.chart_pool.reserve(ctx.author.id):
+                    try:
+                        png = await self.chart_pool.render(hist, ticker)
+                    except ValueError:
+                        await ctx.send(f"Not enough price history to chart {ticker.upper()}.")
+                        return
+                self.chart_cache.put(ticker, hist, png)
+
+            self._record_request(ticker)
+            await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{ticker.upper()}_chart.png"))
+        except ChartUserLimit:
+            await ctx.send("You already have charts rendering, please wait for them to finish.")
+        except ChartQueueFull:
+            await ctx.send("📈 The chart renderer is busy right now, please try again in a moment.")
+        except Exception as e:
+            await ctx.send(f"Error getting chart for {ticker}: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
+
     @commands.command()
     async def list_components(self, ctx, index: str = "all"):
         """List components of major indices
@@ -10,18 +10,21 @@ load_dotenv()
 # Get Discord token from environment
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 
+# Cogs loaded by default; the cron scripts load only what they use
+EXTENSIONS = ('cogs.reports', 'cogs.economy', 'cogs.stock', 'cogs.fun', 'cogs.admin')
+
 class DiscordBot(commands.Bot):
-    def __init__(self):
+    def __init__(self, extensions=EXTENSIONS):
+        self.extensions_to_load = tuple(extensions)
         intents = discord.Intents.default()
         intents.message_content = True
         
         super().__init__(command_prefix='!', intents=intents)
         
     async def setup_hook(self):
-        # Load all cogs
-        await self.load_extension('cogs.reports')
-        await self.load_extension('cogs.economy')
-        await self.load_extension('cogs.fun')
+        # Load the cogs
+        for extension in self.extensions_to_load:
+            await self.load_extension(extension)
         
     async def on_ready(self):
         print(f'{self.user} has connected to Discord!')
@@ -0,0 +1,23 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to Python path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from cogs.reports import Reports
+from utils.chart_gallery import build_gallery
+
+async def build(is_weekly):
+    # Only the earnings lookup is used, so the cog doesn't need a running bot
+    reports = Reports(None)
+    earnings = await reports.get_earnings_data("week" if is_weekly else "day")
+    tickers = reports.gallery_tickers(earnings)
+    print(f"Building chart gallery for {len(tickers)} tickers...")
+    gallery = build_gallery(tickers)
+    print(f"Chart gallery ready: {len(gallery)} charts")
+
+if __name__ == "__main__":
+    # Usage: python build_chart_gallery.py [--weekly]
+    # Schedule ahead of the report so it only has to attach the stored images
+    asyncio.run(build("--weekly" in sys.argv[1:]))
@@ -31,7 +31,8 @@ async def send_macro_reminder(time_str):
         print("Error: CHANNEL_ID not set. Please set the CHANNEL_ID at the top of the script.")
         return
 
-    bot = DiscordBot()
+    # Sending one message doesn't need any cogs or their market data dependencies
+    bot = DiscordBot(extensions=())
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         print("Error: DISCORD_TOKEN not set")
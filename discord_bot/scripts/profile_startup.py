@@ -0,0 +1,84 @@
+"""
+Cold-start profile for the bot and the cron scripts.
+
+Each measurement runs in a fresh interpreter so nothing is already imported:
+first the wall time to import the bot and load each launch's cogs (without
+logging in), then a python -X importtime breakdown of the heaviest imports.
+
+    python scripts/profile_startup.py [--top 10]
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+BOT_DIR = Path(__file__).parent.parent
+
+# What each kind of launch loads
+LAUNCHES = {
+    'macro reminder': (),
+    'daily/weekly report': ('cogs.reports', 'cogs.economy'),
+    'bot (all cogs)': None,  # main.EXTENSIONS
+}
+
+STARTUP_SNIPPET = """
+import asyncio, time
+started = time.perf_counter()
+from main import DiscordBot, EXTENSIONS
+extensions = {extensions!r}
+
+async def load():
+    bot = DiscordBot(extensions=EXTENSIONS if extensions is None else extensions)
+    async with bot:
+        for extension in bot.extensions_to_load:
+            await bot.load_extension(extension)
+        print(f"STARTUP {{time.perf_counter() - started:.4f}}")
+
+asyncio.run(load())
+"""
+
+def measure_startup(extensions):
+    """Seconds from interpreter start to the cogs being loaded, in a fresh process"""
+    result = subprocess.run([sys.executable, '-c', STARTUP_SNIPPET.format(extensions=extensions)],
+                            cwd=BOT_DIR, capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP '):
+            return float(line.split()[1])
+    raise RuntimeError(f"Startup measurement failed:\n{result.stderr}")
+
+def import_times(module):
+    """Packages imported by importing a module, as (cumulative seconds, package), heaviest first"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=BOT_DIR, capture_output=True, text=True)
+    total = 0.0
+    packages = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        seconds = int(cumulative) / 1e6
+        name = name.strip()
+        if name == module:
+            total = seconds
+        elif '.' not in name and not name.startswith('_'):
+            # Each package's first import, including everything it pulls in
+            packages.append((seconds, name))
+    return total, sorted(packages, reverse=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile bot and cron script startup")
+    parser.add_argument('--top', type=int, default=10, help="Heaviest imports to list per module")
+    args = parser.parse_args()
+
+    print("Startup (import + load cogs, no login):")
+    for name, extensions in LAUNCHES.items():
+        print(f"  {name:<22} {measure_startup(extensions) * 1000:>8.0f} ms")
+
+    for module in ('main', 'cogs.reports', 'cogs.economy', 'cogs.stock'):
+        total, packages = import_times(module)
+        print(f"\nimport {module}: {total * 1000:.0f} ms, heaviest packages:")
+        for seconds, name in packages[:args.top]:
+            print(f"  {seconds * 1000:>8.1f} ms  {name}")
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from main import DiscordBot
 
 async def run_report():
-    bot = DiscordBot()
+    # The report only needs its own cog and the economic events
+    bot = DiscordBot(extensions=('cogs.reports', 'cogs.economy'))
     token = os.getenv("DISCORD_TOKEN")
     if not token:
         print("Error: DISCORD_TOKEN not set")
@@ -0,0 +1,225 @@
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BAR_DIR = pathlib.Path(__file__).parent.parent / 'data' / 'bars'
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+BAR_DTYPE = np.dtype([('date', 'datetime64[D]')] + [(column, 'f8') for column in BAR_COLUMNS])
+
+DateRange = Tuple[date, date]
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Merge inclusive date ranges that overlap or touch into a sorted list"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def missing_ranges(held: List[DateRange], start: date, end: date) -> List[DateRange]:
+    """Parts of the inclusive range start..end not covered by the merged held ranges"""
+    missing: List[DateRange] = []
+    cursor = start
+    for held_start, held_end in held:
+        if held_end < cursor:
+            continue
+        if held_start > end:
+            break
+        if held_start > cursor:
+            missing.append((cursor, held_start - timedelta(days=1)))
+        cursor = max(cursor, held_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+ADJUSTMENT_COLUMNS = ('Stock Splits', 'Dividends')
+
+def fetch_daily_bars(ticker: str, start: date, end: date) -> pd.DataFrame:
+    """
+    Download daily bars for the inclusive range start..end from Yahoo Finance
+
+    Prices are split and dividend adjusted as of the fetch; the Stock Splits and
+    Dividends columns show when that basis changes (see BarStore.get_bars).
+    """
+    import yfinance as yf
+    return yf.Ticker(ticker).history(start=start, end=end + timedelta(days=1), interval="1d",
+                                     auto_adjust=True, actions=True)
+
+def has_adjustment(df: pd.DataFrame) -> bool:
+    """Whether fetched bars include a split or dividend, which re-adjusts every earlier price"""
+    return any(column in df and (df[column].fillna(0) != 0).any() for column in ADJUSTMENT_COLUMNS)
+
+class BarStore:
+    def __init__(self, directory: pathlib.Path = DEFAULT_BAR_DIR,
+                 fetcher: Callable[[str, date, date], pd.DataFrame] = fetch_daily_bars,
+                 live_ttl: int = 300):
+        """
+        On-disk store of daily OHLCV bars, one memory-mapped NumPy file per ticker
+
+        Args:
+            directory (pathlib.Path): Directory holding the bar files (default: data/bars)
+            fetcher (Callable): Upstream fetch for an inclusive date range of one ticker
+            live_ttl (int): Seconds today's still-forming bar is reused before refetching (default: 300s)
+        """
+        self.directory = pathlib.Path(directory)
+        self.fetcher = fetcher
+        self.live_ttl = live_ttl
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _paths(self, ticker: str) -> Tuple[pathlib.Path, pathlib.Path]:
+        name = re.sub(r'[^A-Z0-9.^-]', '_', ticker)
+        return self.directory / f"{name}.npy", self.directory / f"{name}.json"
+
+    def _load_meta(self, ticker: str) -> Tuple[List[DateRange], Optional[Tuple[date, float]]]:
+        """Completed date ranges held for a ticker, plus the date and fetch time of the live bar"""
+        _, meta_path = self._paths(ticker)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return [], None
+        ranges = [(date.fromisoformat(s), date.fromisoformat(e)) for s, e in meta.get('ranges', [])]
+        live = meta.get('live')
+        return ranges, (date.fromisoformat(live['date']), live['fetched_at']) if live else None
+
+    def held_ranges(self, ticker: str) -> List[DateRange]:
+        """
+        Date ranges already held for a ticker, including today if its bar was fetched recently
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            List[DateRange]: Sorted, merged inclusive date ranges
+        """
+        ranges, live = self._load_meta(ticker.upper())
+        if live is not None:
+            live_date, fetched_at = live
+            if live_date == datetime.now().date() and time.time() - fetched_at < self.live_ttl:
+                ranges = merge_ranges(ranges + [(live_date, live_date)])
+        return ranges
+
+    def covers(self, ticker: str, start: date, end: date) -> bool:
+        """Whether the store can answer start..end without going upstream"""
+        return not missing_ranges(self.held_ranges(ticker), start, end)
+
+    def _read(self, ticker: str) -> np.ndarray:
+        bars_path, _ = self._paths(ticker)
+        if not bars_path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+        return np.load(bars_path, mmap_mode='r')
+
+    def _write(self, ticker: str, bars: np.ndarray, ranges: List[DateRange],
+               live: Optional[Tuple[date, float]]) -> None:
+        """Atomically replace the bar file and its range metadata"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        bars_path, meta_path = self._paths(ticker)
+
+        tmp_bars = bars_path.with_suffix('.npy.tmp')
+        with open(tmp_bars, 'wb') as f:
+            np.save(f, bars)
+        os.replace(tmp_bars, bars_path)
+
+        tmp_meta = meta_path.with_suffix('.json.tmp')
+        with open(tmp_meta, 'w') as f:
+            json.dump({
+                'ranges': [[s.isoformat(), e.isoformat()] for s, e in ranges],
+                'live': {'date': live[0].isoformat(), 'fetched_at': live[1]} if live else None
+            }, f)
+        os.replace(tmp_meta, meta_path)
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame) -> np.ndarray:
+        """Convert a yfinance history frame to bar records"""
+        records = np.empty(len(df), dtype=BAR_DTYPE)
+        if df.empty:
+            return records
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        records['date'] = index.normalize().values.astype('datetime64[D]')
+        for column in BAR_COLUMNS:
+            records[column] = df[column].to_numpy(dtype='f8') if column in df else np.nan
+        return records
+
+    @staticmethod
+    def _merge_records(existing: np.ndarray, new: np.ndarray) -> np.ndarray:
+        """Combine bar records, preferring new rows on duplicate dates, sorted by date"""
+        combined = np.concatenate([np.asarray(existing), new])
+        # np.unique keeps the first occurrence, so search the reversed array to keep the newest
+        _, first = np.unique(combined['date'][::-1], return_index=True)
+        return combined[::-1][first]
+
+    def get_bars(self, ticker: str, start: date, end: Optional[date] = None) -> pd.DataFrame:
+        """
+        Get daily bars for an inclusive date range, fetching only missing dates upstream
+
+        Args:
+            ticker (str): Ticker symbol
+            start (date): First date to include
+            end (Optional[date]): Last date to include (default: today)
+
+        Returns:
+            pd.DataFrame: OHLCV bars indexed by date
+        """
+        ticker = ticker.upper()
+        today = datetime.now().date()
+        end = min(end or today, today)
+
+        with self._lock(ticker):
+            missing = missing_ranges(self.held_ranges(ticker), start, end)
+            if missing:
+                held, live = self._load_meta(ticker)
+                bars = np.array(self._read(ticker))
+                fetched = [(s, e, self.fetcher(ticker, s, e)) for s, e in missing]
+                if held and any(has_adjustment(df) for _, _, df in fetched):
+                    # Stored bars were adjusted before this split or dividend, so they're on a
+                    # different price basis now; drop them and refetch the whole span
+                    span_start = min(held[0][0], start)
+                    held, live, bars = [], None, np.empty(0, dtype=BAR_DTYPE)
+                    fetched = [(span_start, end, self.fetcher(ticker, span_start, end))]
+                changed = False
+                for fetch_start, fetch_end, df in fetched:
+                    records = self._to_records(df)
+                    # yfinance logs most failures and returns an empty frame, so an empty
+                    # answer only counts as held when the range had no trading days
+                    if not len(records) and np.busday_count(fetch_start, fetch_end + timedelta(days=1)):
+                        continue
+                    bars = self._merge_records(bars, records)
+                    changed = True
+                    # Today's bar is still forming, so only mark completed days as held
+                    # and remember when the live bar was fetched
+                    held_end = min(fetch_end, today - timedelta(days=1))
+                    if held_end >= fetch_start:
+                        held.append((fetch_start, held_end))
+                    if fetch_end == today:
+                        live = (today, time.time())
+                # Tickers that returned nothing at all, such as typos, leave no files behind
+                if changed and (len(bars) or self._paths(ticker)[1].exists()):
+                    self._write(ticker, bars, merge_ranges(held), live)
+
+            bars = self._read(ticker)
+            mask = (bars['date'] >= np.datetime64(start)) & (bars['date'] <= np.datetime64(end))
+            selected = np.array(bars[mask])
+
+        df = pd.DataFrame({column: selected[column] for column in BAR_COLUMNS},
+                          index=pd.DatetimeIndex(selected['date'].astype('datetime64[ns]'), name='Date'))
+        return df
@@ -0,0 +1,232 @@
+import os
+import pathlib
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+DRIVER_PATH_FILE = pathlib.Path(__file__).parent.parent / 'data' / 'chromedriver_path.txt'
+POOL_SIZE = 3  # Browser sessions kept alive
+MAX_USES = 25  # Pages a session loads before it's replaced, to cap memory growth
+
+def resolve_driver_path(path_file=DRIVER_PATH_FILE, use_cached=True):
+    """
+    Local chromedriver path, asking webdriver_manager only when nothing is cached
+
+    Checks CHROMEDRIVER_PATH, then the path saved by an earlier run, then
+    chromedriver on PATH. Only if none of them exists is webdriver_manager used
+    (a network lookup), and the path it returns is saved for later runs.
+
+    Args:
+        path_file (pathlib.Path): File the resolved path is saved in (default: data/chromedriver_path.txt)
+        use_cached (bool): Consider the saved path; False forces a fresh lookup (default: True)
+
+    Returns:
+        str: Path to the chromedriver executable
+    """
+    saved = path_file.read_text().strip() if use_cached and path_file.is_file() else None
+    for candidate in (os.environ.get('CHROMEDRIVER_PATH'), saved, shutil.which('chromedriver')):
+        if candidate and os.path.isfile(candidate):
+            return candidate
+
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    path_file.parent.mkdir(parents=True, exist_ok=True)
+    path_file.write_text(path)
+    return path
+
+class PooledSession:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.started = time.monotonic()
+
+class BrowserPool:
+    def __init__(self, options_factory, size=POOL_SIZE, max_uses=MAX_USES, driver_path=None):
+        """
+        Long-lived Chrome sessions shared by scrapes
+
+        Sessions start once and are handed out with session(). Each one is
+        health-checked before it's handed out. It is replaced after max_uses pages,
+        or when it stops responding.
+
+        Args:
+            options_factory (Callable): Returns the ChromeOptions for a new session
+            size (int): Most sessions alive at once; session() blocks when all are busy (default: POOL_SIZE)
+            max_uses (int): Pages a session serves before being recycled (default: MAX_USES)
+            driver_path (str): chromedriver to use (default: resolve_driver_path(), once, on first launch)
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.max_uses = max_uses
+        self._options_factory = options_factory
+        self._driver_path = driver_path
+        self._driver_path_cached = False  # Whether _driver_path came from DRIVER_PATH_FILE
+        self._driver_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle = []
+        self._closed = False
+        self.stats = {'launched': 0, 'recycled': 0, 'unhealthy': 0, 'uses': 0, 'launch_time': 0.0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def driver_path(self):
+        """chromedriver for new sessions, resolved once for the whole pool"""
+        with self._driver_lock:
+            if self._driver_path is None:
+                saved = DRIVER_PATH_FILE.read_text().strip() if DRIVER_PATH_FILE.is_file() else None
+                self._driver_path = resolve_driver_path()
+                self._driver_path_cached = self._driver_path == saved and \
+                    self._driver_path != os.environ.get('CHROMEDRIVER_PATH')
+            return self._driver_path
+
+    def _reresolve_driver_path(self, failed_path):
+        """
+        Forget a saved driver path that failed to launch and look it up again
+
+        A saved path goes stale when Chrome updates itself past the driver's version.
+
+        Returns:
+            bool: True if a different path was found to retry with
+        """
+        with self._driver_lock:
+            if self._driver_path != failed_path:
+                return True  # Another session already re-resolved it
+            if not self._driver_path_cached:
+                return False
+            print(f"Chrome failed to start with the saved driver {failed_path}, resolving it again")
+            DRIVER_PATH_FILE.unlink(missing_ok=True)
+            self._driver_path_cached = False
+            self._driver_path = resolve_driver_path(use_cached=False)
+            return self._driver_path != failed_path
+
+    def _launch(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        path = self.driver_path()
+        started = time.monotonic()
+        try:
+            driver = webdriver.Chrome(service=Service(path), options=self._options_factory())
+        except Exception:
+            if not self._reresolve_driver_path(path):
+                raise
+            driver = webdriver.Chrome(service=Service(self.driver_path()), options=self._options_factory())
+        self._count('launched')
+        self._count('launch_time', time.monotonic() - started)
+        return PooledSession(driver)
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def is_healthy(driver):
+        """True if the browser still answers a trivial script"""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def start(self, sessions=None):
+        """
+        Launch sessions ahead of the first scrape
+
+        Args:
+            sessions (int): Sessions to have ready (default: the pool size)
+        """
+        wanted = min(self.size, sessions or self.size)
+        with self._lock:
+            missing = wanted - len(self._idle)
+        launched = [self._launch() for _ in range(max(missing, 0))]
+        with self._lock:
+            self._idle.extend(launched)
+
+    def _checkout(self, timeout):
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser session free after {timeout}s")
+        try:
+            while True:
+                with self._lock:
+                    pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    return self._launch()
+                if self.is_healthy(pooled.driver):
+                    return pooled
+                self._count('unhealthy')
+                self._quit(pooled)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, pooled, healthy):
+        try:
+            if not healthy:
+                self._count('unhealthy')
+                self._quit(pooled)
+            elif self._closed:
+                self._quit(pooled)
+            elif pooled.uses >= self.max_uses:
+                self._count('recycled')
+                self._quit(pooled)
+            else:
+                try:
+                    # Drop the page so idle sessions don't hold on to it
+                    pooled.driver.get("about:blank")
+                except Exception:
+                    self._count('unhealthy')
+                    self._quit(pooled)
+                    return
+                with self._lock:
+                    self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Borrow a healthy browser session for one scrape
+
+        Usage:
+            with pool.session() as driver:
+                driver.get(url)
+
+        Args:
+            timeout (float): Seconds to wait for a free session (default: wait indefinitely)
+
+        Yields:
+            WebDriver: Browser session, returned to the pool when the block exits
+        """
+        pooled = self._checkout(timeout)
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            healthy = self.is_healthy(pooled.driver)
+            raise
+        finally:
+            pooled.uses += 1
+            self._count('uses')
+            self._checkin(pooled, healthy)
+
+    def close(self):
+        """Quit every idle session; sessions in use are quit when they're returned"""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled)
+
+    def get_stats(self):
+        """Launch, recycle and use counts, plus the number of idle sessions"""
+        with self._lock:
+            return dict(self.stats, size=self.size, idle=len(self._idle))
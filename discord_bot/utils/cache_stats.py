@@ -0,0 +1,74 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable
+
+# Caches reported by !cachestats, keyed by display name
+_registry: Dict[str, Any] = {}
+
+def register_cache(name: str, cache: Any) -> None:
+    """Make a cache with a get_stats() method visible to !cachestats"""
+    _registry[name] = cache
+
+def registered_caches() -> Dict[str, Any]:
+    """All registered caches, keyed by display name"""
+    return dict(_registry)
+
+def key_family(key: str) -> str:
+    """Family of a cache key, e.g. 'quote' for 'quote:AAPL'"""
+    return key.split(':', 1)[0] if ':' in key else 'other'
+
+class CacheStats:
+    COUNTERS = ('hits', 'misses', 'stale_hits', 'evictions', 'expirations', 'loads', 'load_errors')
+
+    def __init__(self):
+        """Hit, miss, eviction and load latency counters for a cache, per key family"""
+        self.families: Dict[str, Dict[str, float]] = defaultdict(self._new_family)
+        self.throttle_wait = 0.0
+
+    @classmethod
+    def _new_family(cls) -> Dict[str, float]:
+        family = {name: 0 for name in cls.COUNTERS}
+        family['load_time'] = 0.0
+        family['load_time_max'] = 0.0
+        return family
+
+    def record(self, key: str, counter: str, amount: int = 1) -> None:
+        """Add to a counter for the key's family, usually one of COUNTERS"""
+        family = self.families[key_family(key)]
+        family[counter] = family.get(counter, 0) + amount
+
+    def record_load(self, key: str, seconds: float, failed: bool = False) -> None:
+        """Record an upstream load and how long it took"""
+        family = self.families[key_family(key)]
+        family['loads'] += 1
+        if failed:
+            family['load_errors'] += 1
+        family['load_time'] += seconds
+        family['load_time_max'] = max(family['load_time_max'], seconds)
+
+    def snapshot(self, extra_families: Iterable[str] = ()) -> Dict[str, Dict[str, float]]:
+        """
+        Copy of the counters per family, with derived hit rate and average load time
+
+        Args:
+            extra_families (Iterable[str]): Families to include even if nothing was recorded for them
+
+        Returns:
+            Dict[str, Dict[str, float]]: Counters per family, with entries and bytes set to 0
+            for the owning cache to fill in
+        """
+        report = {}
+        for name in list(self.families) + [f for f in extra_families if f not in self.families]:
+            family = dict(self.families.get(name) or self._new_family())
+            family['entries'] = 0
+            family['bytes'] = 0
+            # A stale hit is still answered from the cache, so it counts towards the hit rate
+            served = family['hits'] + family['stale_hits']
+            lookups = served + family['misses']
+            family['hit_rate'] = served / lookups if lookups else 0.0
+            family['load_time_avg'] = family['load_time'] / family['loads'] if family['loads'] else 0.0
+            report[name] = family
+        return report
+
+    def reset(self) -> None:
+        self.families.clear()
+        self.throttle_wait = 0.0
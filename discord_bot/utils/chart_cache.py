@@ -0,0 +1,66 @@
+from typing import Dict, Optional
+
+import pandas as pd
+
+from utils.chart_renderer import chart_params
+from utils.rate_limiting import RateLimitedCache
+
+class ChartCache:
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        """
+        LRU cache of rendered chart PNGs, keyed by ticker, last bar and rendering parameters
+
+        Args:
+            max_entries (int): Maximum number of cached charts (default: 256)
+            max_bytes (int): Byte budget for all cached charts (default: 32MB)
+        """
+        # Charts don't go stale on a timer; a new bar changes the key instead
+        self.cache = RateLimitedCache(cache_ttl=24 * 3600, min_delay=0,
+                                      max_entries=max_entries, max_bytes=max_bytes)
+        self._latest: Dict[str, str] = {}
+
+    @staticmethod
+    def make_key(ticker: str, bars: pd.DataFrame) -> str:
+        """
+        Cache key for a chart of the given bars
+
+        The last bar's close is part of the key because today's bar keeps
+        changing until the close while its timestamp stays the same.
+        """
+        if bars.empty:
+            return f"chart:{ticker.upper()}:empty:{chart_params()}"
+        last_ts = pd.Timestamp(bars.index[-1])
+        last_close = float(bars['Close'].iloc[-1])
+        return f"chart:{ticker.upper()}:{last_ts:%Y-%m-%d}:{last_close:.4f}:{chart_params()}"
+
+    def get(self, ticker: str, bars: pd.DataFrame) -> Optional[bytes]:
+        """
+        Cached chart for these bars
+
+        Args:
+            ticker (str): Ticker symbol
+            bars (pd.DataFrame): Bars the chart would be rendered from
+
+        Returns:
+            Optional[bytes]: PNG image, None if not cached
+        """
+        return self.cache.get(self.make_key(ticker, bars))
+
+    def put(self, ticker: str, bars: pd.DataFrame, png: bytes) -> None:
+        """
+        Store a rendered chart, dropping the ticker's chart for any older bar
+
+        Args:
+            ticker (str): Ticker symbol
+            bars (pd.DataFrame): Bars the chart was rendered from
+            png (bytes): PNG image
+        """
+        key = self.make_key(ticker, bars)
+        previous = self._latest.get(ticker.upper())
+        if previous is not None and previous != key:
+            self.cache.delete(previous)
+        self._latest[ticker.upper()] = key
+        self.cache.set(key, png)
+
+    def get_stats(self):
+        return self.cache.get_stats()
@@ -0,0 +1,131 @@
+import os
+import pathlib
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utils.chart_renderer import render_fib_chart
+
+DEFAULT_GALLERY_DIR = pathlib.Path(__file__).parent.parent / 'data' / 'charts'
+GALLERY_DAYS = 250  # Calendar days of bars, enough for the 50-day SMA warmup and the 60-bar window
+KEEP_DAYS = 7  # Dated gallery folders kept on disk
+
+def download_gallery_bars(tickers: List[str], days: int = GALLERY_DAYS) -> Dict[str, pd.DataFrame]:
+    """
+    Download daily bars for every ticker in one bulk request
+
+    Args:
+        tickers (List[str]): Ticker symbols
+        days (int): Calendar days of history (default: GALLERY_DAYS)
+
+    Returns:
+        Dict[str, pd.DataFrame]: OHLCV bars per ticker; tickers without data are left out
+    """
+    import yfinance as yf
+    data = yf.download(tickers, period=f"{days}d", interval="1d", group_by="column",
+                       progress=False, threads=True)
+    if data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        data.columns = pd.MultiIndex.from_product([data.columns, tickers])
+
+    bars = {}
+    for ticker in tickers:
+        if ticker not in data.columns.get_level_values(1):
+            continue
+        df = data.xs(ticker, axis=1, level=1).dropna(how='all')
+        if not df.empty:
+            bars[ticker] = df
+    return bars
+
+def render_gallery(bars: Dict[str, pd.DataFrame], max_workers: Optional[int] = None) -> Dict[str, bytes]:
+    """
+    Render a Fibonacci chart for each ticker in parallel worker processes
+
+    Args:
+        bars (Dict[str, pd.DataFrame]): Daily bars per ticker
+        max_workers (Optional[int]): Worker processes (default: one per core)
+
+    Returns:
+        Dict[str, bytes]: PNG image per ticker; tickers that can't be charted are left out
+    """
+    if not bars:
+        return {}
+    charts = {}
+    with ProcessPoolExecutor(max_workers=min(max_workers or os.cpu_count() or 1, len(bars))) as executor:
+        futures = {ticker: executor.submit(render_fib_chart, df, ticker) for ticker, df in bars.items()}
+        for ticker, future in futures.items():
+            try:
+                charts[ticker] = future.result()
+            except Exception as e:
+                print(f"Error rendering chart for {ticker}: {e}")
+    return charts
+
+def gallery_path(day: Optional[date] = None, directory: pathlib.Path = DEFAULT_GALLERY_DIR) -> pathlib.Path:
+    """Folder holding the gallery for a day (default: today)"""
+    return directory / (day or date.today()).isoformat()
+
+def build_gallery(tickers: Iterable[str], day: Optional[date] = None,
+                  directory: pathlib.Path = DEFAULT_GALLERY_DIR, max_workers: Optional[int] = None) -> Dict[str, pathlib.Path]:
+    """
+    Download, render and store charts for a set of tickers
+
+    Charts already stored for the day are kept, so only missing tickers are
+    downloaded and rendered.
+
+    Args:
+        tickers (Iterable[str]): Ticker symbols
+        day (Optional[date]): Gallery date (default: today)
+        directory (pathlib.Path): Root folder for galleries (default: data/charts)
+        max_workers (Optional[int]): Render worker processes (default: one per core)
+
+    Returns:
+        Dict[str, pathlib.Path]: Chart image path per ticker, for every ticker that could be charted
+    """
+    tickers = sorted({t.upper() for t in tickers})
+    folder = gallery_path(day, directory)
+    existing = load_gallery(day, directory)
+    missing = [t for t in tickers if t not in existing]
+
+    if missing:
+        started = time.perf_counter()
+        bars = download_gallery_bars(missing)
+        charts = render_gallery(bars, max_workers)
+        folder.mkdir(parents=True, exist_ok=True)
+        for ticker, png in charts.items():
+            tmp = folder / f"{ticker}.png.tmp"
+            tmp.write_bytes(png)
+            os.replace(tmp, folder / f"{ticker}.png")
+        print(f"Rendered {len(charts)} of {len(missing)} gallery charts in {time.perf_counter() - started:.1f}s")
+        prune_galleries(directory)
+
+    gallery = load_gallery(day, directory)
+    return {t: gallery[t] for t in tickers if t in gallery}
+
+def load_gallery(day: Optional[date] = None, directory: pathlib.Path = DEFAULT_GALLERY_DIR) -> Dict[str, pathlib.Path]:
+    """
+    Charts stored for a day
+
+    Args:
+        day (Optional[date]): Gallery date (default: today)
+        directory (pathlib.Path): Root folder for galleries (default: data/charts)
+
+    Returns:
+        Dict[str, pathlib.Path]: Chart image path per ticker
+    """
+    folder = gallery_path(day, directory)
+    if not folder.is_dir():
+        return {}
+    return {path.stem: path for path in sorted(folder.glob('*.png'))}
+
+def prune_galleries(directory: pathlib.Path = DEFAULT_GALLERY_DIR, keep: int = KEEP_DAYS) -> None:
+    """Delete all but the newest `keep` dated gallery folders"""
+    if not directory.is_dir():
+        return
+    folders = sorted(path for path in directory.iterdir() if path.is_dir())
+    for folder in folders[:-keep]:
+        shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,105 @@
+import asyncio
+import contextlib
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Hashable, Iterator, Optional
+
+import pandas as pd
+
+from utils.chart_renderer import render_fib_chart
+
+class ChartQueueFull(Exception):
+    """Raised when the render queue has no room for another chart"""
+
+class ChartUserLimit(ChartQueueFull):
+    """Raised when a user already has their share of charts queued or rendering"""
+
+class ChartRenderPool:
+    def __init__(self, max_workers: Optional[int] = None, max_queue: int = 16, max_per_user: int = 2):
+        """
+        Render charts in worker processes behind a bounded, per-user fair queue
+
+        Args:
+            max_workers (Optional[int]): Worker processes (default: one per core, leaving one for the bot)
+            max_queue (int): Charts allowed to wait for a free worker before new ones are refused (default: 16)
+            max_per_user (int): Charts one user may have queued or rendering at once (default: 2)
+        """
+        self.max_workers = max_workers or max((os.cpu_count() or 2) - 1, 1)
+        self.max_queue = max_queue
+        self.max_per_user = max_per_user
+        self.active = 0
+        self._per_user: Counter = Counter()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        """Charts that may be rendering or waiting at once"""
+        return self.max_workers + self.max_queue
+
+    @contextlib.contextmanager
+    def reserve(self, user_id: Optional[Hashable] = None) -> Iterator[None]:
+        """
+        Claim a place in the queue for the duration of the block, failing fast if there is none
+
+        Args:
+            user_id (Optional[Hashable]): Requesting user, for the per-user limit
+
+        Raises:
+            ChartUserLimit: If the user already has max_per_user charts in the queue
+            ChartQueueFull: If the queue is at capacity
+        """
+        if user_id is not None and self._per_user[user_id] >= self.max_per_user:
+            raise ChartUserLimit(f"User {user_id} already has {self.max_per_user} charts queued")
+        if self.active >= self.capacity:
+            raise ChartQueueFull(f"Chart queue is full ({self.capacity} charts)")
+
+        self.active += 1
+        if user_id is not None:
+            self._per_user[user_id] += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            if user_id is not None:
+                self._per_user[user_id] -= 1
+                if self._per_user[user_id] <= 0:
+                    del self._per_user[user_id]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def render(self, df: pd.DataFrame, ticker: str) -> bytes:
+        """
+        Render a Fibonacci chart in a worker process
+
+        Args:
+            df (pd.DataFrame): Daily OHLCV bars indexed by date, oldest first
+            ticker (str): Ticker symbol
+
+        Returns:
+            bytes: PNG image
+
+        Raises:
+            ValueError: If there aren't enough bars to chart
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return await loop.run_in_executor(executor, render_fib_chart, df, ticker)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool (unless another job already did) and retry once
+            if self._executor is executor:
+                print("Chart worker pool broke, restarting it")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            return await loop.run_in_executor(self._get_executor(), render_fib_chart, df, ticker)
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
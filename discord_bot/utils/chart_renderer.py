@@ -0,0 +1,183 @@
+import io
+import threading
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from utils.indicators import fib_levels, rolling_mean
+
+# Rendering parameters for the Fibonacci chart
+CHART_WINDOW = 60  # Bars shown and used for the high/low range
+SMA_FAST = 10
+SMA_SLOW = 50
+FIB_LEVELS = (0.7, 0.786)
+FIB_COLORS = {0.786: 'orange', 0.7: 'brown'}
+
+# Candle colors (RGBA) matching mplfinance's 'default' style
+CANDLE_UP = (1.0, 1.0, 1.0, 0.9)
+CANDLE_DOWN = (0.0, 0.0, 0.0, 0.9)
+CANDLE_WIDTH = 0.6
+
+def chart_params() -> str:
+    """Identifies the rendering parameters, so cached charts change when they do"""
+    return f"w{CHART_WINDOW}-sma{SMA_FAST}.{SMA_SLOW}-fib{'.'.join(str(level) for level in FIB_LEVELS)}"
+
+def compute_fib_levels(df: pd.DataFrame) -> Dict[float, float]:
+    """
+    Fibonacci retracement levels over the high/low range of a window of bars
+
+    Args:
+        df (pd.DataFrame): Bars with High and Low columns
+
+    Returns:
+        Dict[float, float]: Price for each level in FIB_LEVELS
+    """
+    levels = fib_levels(df['High'].to_numpy(), df['Low'].to_numpy(), len(df), FIB_LEVELS)
+    return {level: float(values[-1]) for level, values in levels.items()}
+
+def prepare_chart_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add moving averages and cut daily bars down to the charted window
+
+    Args:
+        df (pd.DataFrame): Daily OHLCV bars indexed by date, oldest first
+
+    Returns:
+        pd.DataFrame: The last CHART_WINDOW bars with SMA columns
+
+    Raises:
+        ValueError: If there aren't enough bars for the moving averages and the window
+    """
+    if df.empty or len(df) < CHART_WINDOW:
+        raise ValueError("Not enough data available for calculations.")
+
+    df = df.copy()
+    df.index = pd.to_datetime(df.index)
+    close = df['Close'].to_numpy(dtype=float)
+    df[f'SMA_{SMA_FAST}'] = rolling_mean(close, SMA_FAST)
+    df[f'SMA_{SMA_SLOW}'] = rolling_mean(close, SMA_SLOW)
+    df = df.dropna(subset=[f'SMA_{SMA_FAST}', f'SMA_{SMA_SLOW}'])
+    if len(df) < CHART_WINDOW:
+        raise ValueError("Not enough data available for calculations.")
+    return df.tail(CHART_WINDOW)
+
+class ChartCanvas:
+    def __init__(self):
+        """
+        A figure drawn straight onto an Agg canvas, with its artists built once
+
+        Each render only swaps the data in the existing candle collections, level
+        lines and labels, skipping the figure setup and the mplfinance pipeline.
+        """
+        # matplotlib is imported on first render, not when the bot loads
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import FuncFormatter, MaxNLocator
+
+        self.fig = Figure()
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot()
+        self.dates = pd.DatetimeIndex([])
+
+        self.wicks = LineCollection([], colors='k', linewidths=0.8)
+        self.bodies = PolyCollection([], edgecolors='k', linewidths=0.6)
+        self.ax.add_collection(self.wicks)
+        self.ax.add_collection(self.bodies)
+
+        self.fib_lines = {
+            level: self.ax.axhline(y=0, color=FIB_COLORS.get(level, 'gray'), linestyle='dashed',
+                                   linewidth=1.5, label=f'Fib {level}')
+            for level in sorted(FIB_LEVELS, reverse=True)
+        }
+        self.title = self.ax.set_title("")
+        self.ax.set_ylabel("Price (USD)")
+        self.ax.legend()
+
+        # Candles sit at integer positions; label them with the bar dates, like mplfinance
+        self.ax.xaxis.set_major_locator(MaxNLocator(nbins=6, integer=True))
+        self.ax.xaxis.set_major_formatter(FuncFormatter(self._format_date))
+
+    def _format_date(self, x: float, pos=None) -> str:
+        i = int(round(x))
+        return self.dates[i].strftime('%b %d') if 0 <= i < len(self.dates) else ''
+
+    def render(self, window: pd.DataFrame, levels: Dict[float, float], ticker: str) -> bytes:
+        """Draw prepared bars and levels onto the reused figure and return a PNG"""
+        opens, highs, lows, closes = (window[c].to_numpy(dtype=float) for c in ('Open', 'High', 'Low', 'Close'))
+        x = np.arange(len(window), dtype=float)
+        left, right = x - CANDLE_WIDTH / 2, x + CANDLE_WIDTH / 2
+
+        self.bodies.set_verts(np.stack([
+            np.column_stack([left, opens]), np.column_stack([left, closes]),
+            np.column_stack([right, closes]), np.column_stack([right, opens]),
+        ], axis=1))
+        self.bodies.set_facecolors(np.where((closes >= opens)[:, None], CANDLE_UP, CANDLE_DOWN))
+        self.wicks.set_segments(np.stack([np.column_stack([x, lows]), np.column_stack([x, highs])], axis=1))
+
+        for level, line in self.fib_lines.items():
+            line.set_ydata([levels[level], levels[level]])
+
+        low, high = float(lows.min()), float(highs.max())
+        pad = (high - low) * 0.05 or 1.0
+        self.ax.set_xlim(-1, len(window))
+        self.ax.set_ylim(low - pad, high + pad)
+        self.title.set_text(f"{ticker.upper()} Chart")
+        self.dates = pd.DatetimeIndex(window.index)
+
+        buffer = io.BytesIO()
+        self.canvas.print_png(buffer)
+        return buffer.getvalue()
+
+# One reusable canvas per thread, so worker processes and threads never share a figure
+_canvases = threading.local()
+
+def _get_canvas() -> ChartCanvas:
+    canvas = getattr(_canvases, 'canvas', None)
+    if canvas is None:
+        canvas = _canvases.canvas = ChartCanvas()
+    return canvas
+
+def render_fib_chart(df: pd.DataFrame, ticker: str, reuse_figure: bool = True) -> bytes:
+    """
+    Render a candlestick chart with Fibonacci retracement levels
+
+    By default the chart is drawn on this thread's reusable ChartCanvas. With
+    reuse_figure=False it goes through mplfinance on a standalone Figure instead;
+    neither path touches pyplot's global figure state or writes to disk.
+
+    Args:
+        df (pd.DataFrame): Daily OHLCV bars indexed by date, oldest first
+        ticker (str): Ticker symbol for the title
+        reuse_figure (bool): Draw on the reusable canvas (default: True)
+
+    Returns:
+        bytes: PNG image
+
+    Raises:
+        ValueError: If there aren't enough bars to chart
+    """
+    window = prepare_chart_data(df)
+    levels = compute_fib_levels(window)
+    if reuse_figure:
+        return _get_canvas().render(window, levels, ticker)
+
+    import mplfinance as mpf
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    ax = fig.add_subplot()
+    mpf.plot(window, type='candle', style='default', ax=ax)
+
+    # Add horizontal lines for Fibonacci levels
+    for level in sorted(FIB_LEVELS, reverse=True):
+        ax.axhline(y=levels[level], color=FIB_COLORS.get(level, 'gray'), linestyle='dashed',
+                   linewidth=1.5, label=f'Fib {level}')
+
+    ax.set_title(f"{ticker.upper()} Chart")
+    ax.set_ylabel("Price (USD)")
+    ax.legend()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
@@ -1,4 +1,11 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
 from datetime import datetime, timedelta
+from utils.cache_stats import CacheStats, key_family, register_cache
+from utils.rate_limiting import estimate_size
+
+CHANGE_LOG_SIZE = 2000  # Most recent event changes kept for consumers
+MONTH_ROWS_KEPT = 6  # Calendar months whose scraped rows are remembered for incremental refreshes
 
 class ForexEventCache:
     def __init__(self, cache_ttl=3600):  # 1 hour TTL by default
@@ -10,15 +17,27 @@ class ForexEventCache:
             'current_month': {},
             'next_month': {}
         }
+        self.stats = CacheStats()
+        # Per calendar month ('YYYY-MM'): data-event-id -> (date, row fingerprint, event) and the
+        # days shown, from the last scrape. Keyed by month rather than bucket so a month keeps
+        # its rows when it moves from next_month to current_month at the rollover.
+        self._month_rows = {}
+        self._month_days = {}
+        self._bucket_months = {}
+        self.change_log = deque(maxlen=CHANGE_LOG_SIZE)
+        self._rebuild_index()
 
     def get(self, key):
         """Get cached data if it exists and is not expired"""
         if key in self._cache:
             data, timestamp = self._cache[key]
             if datetime.now() - timestamp < timedelta(seconds=self._cache_ttl):
+                self.stats.record(key, 'hits')
                 return data
             else:
                 del self._cache[key]
+                self.stats.record(key, 'expirations')
+        self.stats.record(key, 'misses')
         return None
 
     def set(self, key, data):
@@ -41,40 +60,225 @@ class ForexEventCache:
             'current_month': {},
             'next_month': {}
         }
+        self._month_rows = {}
+        self._month_days = {}
+        self._bucket_months = {}
+        self._rebuild_index()
         self._last_scrape = None
 
     def store_month(self, month_key, events):
         """Store events for a specific month"""
         self._monthly_events[month_key] = events
+        # Stored without row ids, so the next refresh of that month starts over
+        month = self._bucket_months.pop(month_key, None)
+        self._month_rows.pop(month, None)
+        self._month_days.pop(month, None)
+        self._rebuild_index()
+
+    def update_month(self, month_key, days, rows, parse_rows, month=None, complete=True):
+        """
+        Refresh a month from scraped rows, re-parsing only rows that are new or changed
+
+        Rows are matched to the previous scrape of the same calendar month by
+        data-event-id and compared by a
+        fingerprint of their markup, so an unchanged page costs no parsing at all.
+        Every added, changed, moved or removed event is appended to change_log.
+        When the page didn't finish loading, events it didn't reach are kept rather
+        than reported as removed.
+
+        Args:
+            month_key (str): Month bucket, e.g. 'current_month'
+            days (List[str]): Every 'YYYY-MM-DD' shown on the page, including days without events
+            rows (List[tuple]): (event_id, 'YYYY-MM-DD', row markup) in page order, from calendar_rows
+            parse_rows (Callable): Turns a list of row markups into events keyed by event id
+                (parse_event_rows)
+            month (str): Calendar month of the page, e.g. '2025-10'; rows are remembered per month
+                so buckets shifting at the month rollover don't look like changes (default: month_key)
+            complete (bool): Whether the whole month loaded; if not, only days before the last
+                one shown are checked for removed events (default: True)
+
+        Returns:
+            List[dict]: The changes made, oldest first (see change_log)
+        """
+        month = month or month_key
+        previous = self._month_rows.get(month, {})
+        # Fingerprints only need to be stable within this process, so the built-in string hash will do
+        fingerprints = {event_id: hash(markup) for event_id, _, markup in rows}
+        stale = [markup for event_id, _, markup in rows
+                 if event_id not in previous or previous[event_id][1] != fingerprints[event_id]]
+        parsed = parse_rows(stale)
+
+        now = datetime.now()
+        changes = []
+        current = {}
+        for event_id, date_str, _ in rows:
+            old = previous.get(event_id)
+            event = parsed.get(event_id, old[2] if old else None)
+            if event is None:
+                continue
+            current[event_id] = (date_str, fingerprints[event_id], event)
+            if old is None:
+                changes.append({'change': 'added', 'date': date_str, 'event': event})
+            elif old[0] != date_str:
+                changes.append({'change': 'moved', 'date': date_str, 'previous_date': old[0], 'event': event})
+            elif old[2] != event:
+                fields = sorted(k for k in set(event) | set(old[2]) if event.get(k) != old[2].get(k))
+                changes.append({'change': 'changed', 'date': date_str, 'fields': fields,
+                                'previous': old[2], 'event': event})
+        # A truncated page may stop partway through its last day, so only earlier days count as seen
+        reached = set(days[:-1])
+        for event_id, row in previous.items():
+            if event_id in current:
+                continue
+            if complete or row[0] in reached:
+                changes.append({'change': 'removed', 'date': row[0], 'event': row[2]})
+            else:
+                current[event_id] = row
+
+        for change in changes:
+            change.update(bucket=month_key, month=month, time=now)
+        self.change_log.extend(changes)
+
+        events = {date_str: [] for date_str in days}
+        if not complete:
+            events.update((date_str, []) for date_str in self._month_days.get(month, []))
+        for date_str, _, event in current.values():
+            events.setdefault(date_str, []).append(event)
+        self._monthly_events[month_key] = dict(sorted(events.items()))
+        self._month_rows[month] = current
+        self._month_days[month] = list(self._monthly_events[month_key])
+        self._bucket_months[month_key] = month
+        self._forget_old_months()
+        self._rebuild_index()
+        return changes
+
+    def _forget_old_months(self):
+        """Drop remembered rows for the oldest months no bucket holds, beyond MONTH_ROWS_KEPT"""
+        held = set(self._bucket_months.values())
+        unheld = sorted(month for month in self._month_rows if month not in held)
+        for month in unheld[:max(len(self._month_rows) - MONTH_ROWS_KEPT, 0)]:
+            del self._month_rows[month]
+            self._month_days.pop(month, None)
+
+    def get_changes(self, since=None):
+        """
+        Logged event changes, oldest first
+
+        Args:
+            since (datetime): Only changes made after this time (default: all kept)
+
+        Returns:
+            List[dict]: Changes with change ('added', 'changed', 'moved' or 'removed'), bucket,
+            month ('YYYY-MM'), time, date and event; 'moved' adds previous_date, 'changed' adds fields and previous
+        """
+        return [change for change in self.change_log if since is None or change['time'] > since]
 
     def get_month(self, month_key):
         """Get events for a specific month"""
         return self._monthly_events.get(month_key, {})
 
+    def _rebuild_index(self):
+        """
+        Index every stored event by date, currency and importance
+
+        Events are laid out in one date-sorted list, so a date range is a slice
+        found by binary search. The currency and importance indexes hold sorted
+        positions into that list, so a filter is a slice of each matching index
+        and combining filters is a set intersection.
+        """
+        by_date = {}
+        for month_events in self._monthly_events.values():
+            for date_str, day_events in month_events.items():
+                by_date.setdefault(date_str, day_events)  # First month wins, as in get_events_for_date
+
+        self._events_by_date = by_date
+        self._scraped_dates = sorted(by_date)  # Includes days without events, for coverage
+        self._events = []
+        self._event_dates = []
+        self._by_currency = {}
+        self._by_importance = {}
+        for date_str in self._scraped_dates:
+            for event in by_date[date_str]:
+                position = len(self._events)
+                self._events.append(event)
+                self._event_dates.append(date_str)
+                self._by_currency.setdefault(event.get('currency'), []).append(position)
+                self._by_importance.setdefault(event.get('importance'), []).append(position)
+
     def get_events_for_date(self, date_str):
         """Get events for a specific date by checking all months"""
-        for month_events in self._monthly_events.values():
-            if date_str in month_events:
-                return month_events[date_str]
-        return []
+        return self._events_by_date.get(date_str, [])
 
     def get_events_in_range(self, start_date, end_date, currency=None, importance=None):
-        """Get events between two dates with optional filters"""
+        """
+        Get events between two dates with optional filters
+
+        Args:
+            start_date (date): First day of the range
+            end_date (date): Last day of the range, inclusive
+            currency (str): Only events for this currency, e.g. 'USD'
+            importance (Iterable[str]): Only events with one of these importance levels
+
+        Returns:
+            dict: Lists of matching events keyed by 'YYYY-MM-DD', for days that have any
+        """
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
+        days = (end_date - start_date).days + 1
+        if days <= 0:
+            self.stats.record('calendar:range', 'hits')
+            return {}
+
+        # A range query hits when every day in it has been scraped into a month bucket
+        scraped = bisect_right(self._scraped_dates, end_str) - bisect_left(self._scraped_dates, start_str)
+        self.stats.record('calendar:range', 'hits' if scraped >= days else 'misses')
+
+        low = bisect_left(self._event_dates, start_str)
+        high = bisect_right(self._event_dates, end_str)
+        positions = None
+        if currency:
+            positions = self._positions_in(self._by_currency.get(currency, []), low, high)
+        if importance:
+            levels = (importance,) if isinstance(importance, str) else importance
+            matching = [p for level in set(levels)
+                        for p in self._positions_in(self._by_importance.get(level, []), low, high)]
+            if positions is None:
+                positions = sorted(matching)
+            else:
+                # Walk the smaller side and probe the larger one
+                small, large = sorted((positions, matching), key=len)
+                large = set(large)
+                positions = sorted(p for p in small if p in large)
+        if positions is None:
+            positions = range(low, high)
+
         events = {}
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime('%Y-%m-%d')
-            day_events = self.get_events_for_date(date_str)
-            
-            # Apply filters
-            if currency:
-                day_events = [e for e in day_events if e['currency'] == currency]
-            if importance:
-                day_events = [e for e in day_events if e['importance'] in importance]
-            
-            if day_events:  # Only add dates that have events
-                events[date_str] = day_events
-            
-            current_date += timedelta(days=1)
-        
-        return events
\ No newline at end of file
+        for position in positions:
+            events.setdefault(self._event_dates[position], []).append(self._events[position])
+        return events
+
+    @staticmethod
+    def _positions_in(positions, low, high):
+        """Part of a sorted position index that falls in [low, high)"""
+        return positions[bisect_left(positions, low):bisect_left(positions, high)]
+
+    def get_stats(self):
+        """Current size and counters, overall and per key family (see RateLimitedCache.get_stats)"""
+        families = self.stats.snapshot(extra_families={'calendar'} | {key_family(k) for k in self._cache})
+        for key, value in self._cache.items():
+            families[key_family(key)]['entries'] += 1
+            families[key_family(key)]['bytes'] += estimate_size(value)
+        for month_events in self._monthly_events.values():
+            families['calendar']['entries'] += len(month_events)
+            families['calendar']['bytes'] += estimate_size(month_events)
+        return {
+            'entries': sum(family['entries'] for family in families.values()),
+            'bytes': sum(family['bytes'] for family in families.values()),
+            'throttle_wait': self.stats.throttle_wait,
+            'families': families,
+        }
+
+# Shared instance, created here rather than in the selenium-based scraper so the
+# running bot can register it without importing the scraper
+event_cache = ForexEventCache(cache_ttl=3600)  # 1 hour cache
+register_cache("forex_events", event_cache)
\ No newline at end of file
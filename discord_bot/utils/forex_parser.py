@@ -0,0 +1,215 @@
+import functools
+import html as html_entities
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  # Much faster tree builder when installed
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Common economic acronyms and their full names
+ECONOMIC_ACRONYMS = {
+    "CPI": r"(?:Core )?Consumer Price Index|CPI",
+    "GDP": r"(?:Prelim )?Gross Domestic Product|GDP",
+    "NFP": r"Non-Farm Payrolls|NFP",
+    "FOMC": r"Federal Open Market Committee|FOMC",
+    "PMI": r"(?:Manufacturing )?Purchasing Managers['\' ]* Index|PMI",
+    "PPI": r"(?:Core )?Producer Price Index|PPI",
+    "ISM": r"ISM (?:Manufacturing |Non-Manufacturing |Services )?(?:PMI|Index)",
+    "BOE": r"Bank of England|BOE",
+    "ECB": r"European Central Bank|ECB",
+    "BOJ": r"Bank of Japan|BOJ",
+    "BOC": r"Bank of Canada|BOC",
+    "RBA": r"Reserve Bank of Australia|RBA",
+    "RBNZ": r"Reserve Bank of New Zealand|RBNZ",
+    "SNB": r"Swiss National Bank|SNB",
+    "HPI": r"House Price Index|HPI",
+    "PCE": r"(?:Core )?Personal Consumption Expenditure|PCE",
+    "HICP": r"Harmonized Index of Consumer Prices|HICP",
+    "ADP": r"ADP Non-Farm Employment Change|ADP",
+}
+
+NAME_PREFIXES = ("Core ", "Prelim ", "Final ")
+
+# Compiled once, in table order, instead of re.search re-looking up each pattern per call
+ACRONYM_PATTERNS = [(acronym, re.compile(pattern, re.IGNORECASE))
+                    for acronym, pattern in ECONOMIC_ACRONYMS.items()]
+
+@functools.lru_cache(maxsize=4096)
+def simplify_event_name(event_name):
+    """Simplify event names by using acronyms where possible; results are memoized per name"""
+    # First check if the event name is already just an acronym
+    if event_name in ECONOMIC_ACRONYMS:
+        return event_name
+
+    lowered = event_name.lower()
+    for acronym, pattern in ACRONYM_PATTERNS:
+        if pattern.search(event_name):
+            # Special cases for common prefixes
+            prefix = next((p for p in NAME_PREFIXES if p.lower() in lowered), None)
+            return f"{prefix}{acronym}" if prefix else acronym
+
+    # Special case for "Speaks" events
+    if "speaks" in lowered:
+        name = event_name.split(" Speaks")[0]
+        return f"{name} Speaks"
+
+    return event_name
+
+def simplify_event_names(event_names):
+    """
+    Simplify many event names, normalizing each distinct name once
+
+    Args:
+        event_names (Iterable[str]): Raw event titles
+
+    Returns:
+        list: Simplified names in the same order
+    """
+    return [simplify_event_name(name) for name in event_names]
+
+IMPACT_CLASSES = (
+    ("ff-impact-red", "High"),
+    ("ff-impact-ora", "Medium"),
+    ("ff-impact-yel", "Low"),
+)
+
+TABLE_START = re.compile(r'<table[^>]*class="[^"]*calendar__table')
+TABLE_TAG = re.compile(r'<(/?)table\b', re.IGNORECASE)
+ROW_PATTERN = re.compile(r'<tr\b([^>]*)>.*?</tr>', re.IGNORECASE | re.DOTALL)
+EVENT_ID_PATTERN = re.compile(r'data-event-id="([^"]+)"')
+TAG_PATTERN = re.compile(r'<[^>]+>')
+DAY_PATTERN = re.compile(r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}", re.IGNORECASE)
+
+def _calendar_table_markup(html):
+    """Slice of the page holding just the calendar table, or the whole page if it isn't found"""
+    start = TABLE_START.search(html)
+    if not start:
+        return html
+    depth = 0
+    for tag in TABLE_TAG.finditer(html, start.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[start.start():html.find('>', tag.end()) + 1]
+    return html[start.start():]
+
+def _text(element):
+    """Visible text of an element with whitespace collapsed, like WebDriver's .text"""
+    return " ".join(element.get_text(" ").split())
+
+def _parse_event_row(row):
+    """Event fields from a calendar row, with the same fallbacks the WebDriver scraper used"""
+    event = {}
+
+    time_cell = row.find(class_="calendar__time")
+    if time_cell is not None:
+        time_div = time_cell.find("div")
+        time_text = _text(time_div) if time_div is not None else _text(time_cell)
+        event['time'] = time_text if time_text else "All Day"
+    else:
+        event['time'] = "All Day"
+
+    currency_cell = row.find(class_="calendar__currency")
+    event['currency'] = _text(currency_cell) if currency_cell is not None else ""
+
+    event_cell = row.find(class_="calendar__event")
+    if event_cell is not None:
+        title = event_cell.find(class_="calendar__event-title")
+        event['event'] = simplify_event_name(_text(title) if title is not None else _text(event_cell))
+    else:
+        event['event'] = ""
+
+    impact_cell = row.find(class_="calendar__impact")
+    if impact_cell is not None:
+        icon = impact_cell.find("span")
+        impact_class = " ".join(icon.get("class", [])) if icon is not None else _text(impact_cell)
+        event['importance'] = next((level for css, level in IMPACT_CLASSES if css in impact_class), "Non-Economic")
+    else:
+        event['importance'] = "Unknown"
+
+    return event
+
+def parse_calendar_html(html, year):
+    """
+    Parse a rendered ForexFactory calendar page into events by date
+
+    Args:
+        html (str): Page source containing the calendar table
+        year (int): Year of the calendar month; day-breaker rows only show month and day
+
+    Returns:
+        dict: Lists of events (time, currency, event, importance) keyed by 'YYYY-MM-DD'
+    """
+    # Cut the table out of the page with a regex scan so the rest of the page is never tokenized
+    soup = BeautifulSoup(_calendar_table_markup(html), HTML_PARSER,
+                         parse_only=SoupStrainer("table", class_="calendar__table"))
+
+    month_data = {}
+    current_date = None
+    for row in soup.find_all("tr"):
+        if "calendar__row--day-breaker" in row.get("class", []):
+            cell = row.find("td")
+            match = DAY_PATTERN.search(cell.get_text() if cell is not None else "")
+            if match:
+                current_date = datetime.strptime(f"{match.group(0)} {year}", "%b %d %Y").strftime("%Y-%m-%d")
+                month_data[current_date] = []
+            continue
+
+        if current_date and row.get("data-event-id"):
+            month_data[current_date].append(_parse_event_row(row))
+
+    return month_data
+
+def calendar_rows(html, year):
+    """
+    Split a calendar page into day and event rows without building a parse tree
+
+    Event rows are returned as raw markup so callers can compare them against a
+    previous scrape and only parse the ones that are new or changed.
+
+    Args:
+        html (str): Page source containing the calendar table
+        year (int): Year of the calendar month
+
+    Returns:
+        tuple: ('YYYY-MM-DD' of every day shown, [(event_id, 'YYYY-MM-DD', row markup), ...] in page order)
+    """
+    days = []
+    rows = []
+    current_date = None
+    for row in ROW_PATTERN.finditer(_calendar_table_markup(html)):
+        attributes = row.group(1)
+        if "calendar__row--day-breaker" in attributes:
+            text = html_entities.unescape(TAG_PATTERN.sub(" ", row.group(0)))
+            match = DAY_PATTERN.search(text)
+            if match:
+                current_date = datetime.strptime(f"{match.group(0)} {year}", "%b %d %Y").strftime("%Y-%m-%d")
+                days.append(current_date)
+            continue
+
+        event_id = EVENT_ID_PATTERN.search(attributes)
+        if current_date and event_id:
+            rows.append((event_id.group(1), current_date, row.group(0)))
+
+    return days, rows
+
+def parse_event_rows(markups):
+    """
+    Parse event row markup from calendar_rows into events, in one parser pass
+
+    Args:
+        markups (Iterable[str]): <tr> markup of event rows
+
+    Returns:
+        dict: Event (time, currency, event, importance) keyed by data-event-id
+    """
+    markups = list(markups)
+    if not markups:
+        return {}
+    soup = BeautifulSoup(f"<table>{''.join(markups)}</table>", HTML_PARSER)
+    return {row["data-event-id"]: _parse_event_row(row)
+            for row in soup.find_all("tr") if row.get("data-event-id")}
@@ -1,84 +1,78 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-from datetime import datetime
-from .forex_cache import ForexEventCache
-import time
-import re
-
-
-# Common economic acronyms and their full names
-ECONOMIC_ACRONYMS = {
-    "CPI": r"(?:Core )?Consumer Price Index|CPI",
-    "GDP": r"(?:Prelim )?Gross Domestic Product|GDP",
-    "NFP": r"Non-Farm Payrolls|NFP",
-    "FOMC": r"Federal Open Market Committee|FOMC",
-    "PMI": r"(?:Manufacturing )?Purchasing Managers['\' ]* Index|PMI",
-    "PPI": r"(?:Core )?Producer Price Index|PPI",
-    "ISM": r"ISM (?:Manufacturing |Non-Manufacturing |Services )?(?:PMI|Index)",
-    "BOE": r"Bank of England|BOE",
-    "ECB": r"European Central Bank|ECB",
-    "BOJ": r"Bank of Japan|BOJ",
-    "BOC": r"Bank of Canada|BOC",
-    "RBA": r"Reserve Bank of Australia|RBA",
-    "RBNZ": r"Reserve Bank of New Zealand|RBNZ",
-    "SNB": r"Swiss National Bank|SNB",
-    "HPI": r"House Price Index|HPI",
-    "PCE": r"(?:Core )?Personal Consumption Expenditure|PCE",
-    "HICP": r"Harmonized Index of Consumer Prices|HICP",
-    "ADP": r"ADP Non-Farm Employment Change|ADP",
-}
-
-def simplify_event_name(event_name):
-    """Simplify event names by using acronyms where possible"""
-    # First check if the event name is already just an acronym
-    if event_name in ECONOMIC_ACRONYMS:
-        return event_name
-        
-    # Check each acronym pattern
-    for acronym, pattern in ECONOMIC_ACRONYMS.items():
-        if re.search(pattern, event_name, re.IGNORECASE):
-            # Special cases for common prefixes
-            if any(prefix in event_name.lower() for prefix in ["core ", "prelim ", "final "]):
-                prefix = next(p for p in ["Core ", "Prelim ", "Final "] 
-                            if p.lower() in event_name.lower())
-                return f"{prefix}{acronym}"
-            return acronym
-            
-    # Special case for "Speaks" events
-    if "speaks" in event_name.lower():
-        name = event_name.split(" Speaks")[0]
-        return f"{name} Speaks"
-        
-    return event_name
-
-# Create a global cache instance
-event_cache = ForexEventCache(cache_ttl=3600)  # 1 hour cache
-
-
-import re
-import time
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+import calendar
+import atexit
+import threading
+from .browser_pool import BrowserPool
+from .forex_cache import event_cache
+from .forex_parser import DAY_PATTERN, ECONOMIC_ACRONYMS, calendar_rows, parse_event_rows, simplify_event_name
+import time
+
+# Page loading limits for the calendar (seconds)
+LOAD_DEADLINE = 30  # Give up waiting for more rows and parse what has loaded
+SETTLE_TIME = 1.5  # Row count unchanged this long means lazy loading has finished
+POLL_INTERVAL = 0.25
+
+# Cache buckets and their offset from the current month
+MONTH_BUCKETS = (('previous_month', -1), ('current_month', 0), ('next_month', 1))
+MAX_SESSIONS = 3  # Concurrent browser sessions for multi-month scrapes
 
-from selenium.webdriver.common.keys import Keys
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
 
-def scrape_forex_factory():
+# Scrolls to the bottom to trigger lazy loading and reports progress in one round-trip
+CALENDAR_PROGRESS_JS = """
+window.scrollTo(0, document.body.scrollHeight);
+const rows = document.querySelectorAll('table.calendar__table tr');
+const days = document.querySelectorAll('table.calendar__table tr.calendar__row--day-breaker');
+return [rows.length, days.length ? days[days.length - 1].textContent : ''];
+"""
+
+def wait_for_calendar(driver, last_day, deadline=LOAD_DEADLINE):
     """
-    Scrapes economic events from ForexFactory for the current month.
-    Returns True if successful, False otherwise.
+    Scroll the calendar until the month has loaded, waiting on the page rather than fixed sleeps
+
+    Loading is done once the last day of the month has a day-breaker row. If the
+    row count stops changing for SETTLE_TIME first, lazy loading has stalled and the
+    wait ends early without the month being complete.
+
+    Args:
+        driver: WebDriver showing the calendar page
+        last_day (date): Last day of the calendar month
+        deadline (float): Overall limit in seconds, including waiting for the table
+
+    Returns:
+        bool: True only if the month's last day was reached; False if loading stalled or
+        the deadline was hit first, so the page may be missing later days
     """
+    started = time.monotonic()
+    WebDriverWait(driver, deadline).until(EC.presence_of_element_located((By.CLASS_NAME, "calendar__table")))
+
+    row_count, settled_at = -1, time.monotonic()
+    while time.monotonic() - started < deadline:
+        count, last_breaker = driver.execute_script(CALENDAR_PROGRESS_JS)
+        match = DAY_PATTERN.search(last_breaker or "")
+        if match and datetime.strptime(f"{match.group(0)} {last_day.year}", "%b %d %Y").date() >= last_day:
+            return True
+        if count != row_count:
+            row_count, settled_at = count, time.monotonic()
+        elif time.monotonic() - settled_at >= SETTLE_TIME:
+            print(f"Calendar stopped loading before {last_day}, parsing the {row_count} rows loaded so far")
+            return False
+        time.sleep(POLL_INTERVAL)
+
+    print(f"Calendar still loading after {deadline}s, parsing the {row_count} rows loaded so far")
+    return False
+
+def chrome_options(headless=False):
+    """Chrome options for the calendar, optionally without a visible window"""
     options = Options()
-    # For now, do not run headless (visible browser)
-    # options.add_argument("--headless")
+    if headless:
+        options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -86,127 +80,89 @@ def scrape_forex_factory():
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
     )
+    return options
+
+def shift_month(day, offset):
+    """(year, month) of the month `offset` months from day's month"""
+    index = day.year * 12 + day.month - 1 + offset
+    return index // 12, index % 12 + 1
+
+def month_label(year, month):
+    """Calendar month as ForexFactory's URL writes it, e.g. 'feb.2025'"""
+    return f"{calendar.month_abbr[month].lower()}.{year}"
+
+def load_month_page(driver, year, month):
+    """
+    Open a calendar month and wait for it to finish lazy loading
+
+    Args:
+        driver: WebDriver to load the page in
+        year (int): Calendar year
+        month (int): Calendar month
+
+    Returns:
+        tuple: (page source, True if the page reached the last day of the month)
+    """
+    url = f"https://www.forexfactory.com/calendar?month={month_label(year, month)}"
+    print(f"\nScraping calendar: {url}")
+    driver.get(url)
+
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    loaded_at = time.monotonic()
+    complete = wait_for_calendar(driver, last_day)
+    print(f"Calendar {month_label(year, month)} loaded in {time.monotonic() - loaded_at:.1f}s")
+    return driver.page_source, complete
 
+def store_month_page(month_key, html, year, month, complete=True):
+    """
+    Refresh a cache bucket from a calendar page, parsing only new or changed rows
+
+    A page that didn't finish loading (complete=False) keeps the cached events for
+    the days it didn't reach instead of dropping them.
+
+    Returns:
+        tuple: (days shown, event rows, changes from ForexEventCache.update_month)
+    """
+    days, rows = calendar_rows(html, year)
+    changes = event_cache.update_month(month_key, days, rows, parse_event_rows,
+                                       month=f"{year}-{month:02d}", complete=complete)
+    return days, rows, changes
+
+def count_changes(changes):
+    """Number of changes of each kind, e.g. {'added': 3, 'moved': 1}"""
+    counts = {}
+    for change in changes:
+        counts[change['change']] = counts.get(change['change'], 0) + 1
+    return counts
+
+def get_browser_pool():
+    """Shared pool of headless browser sessions, started on first use and closed at exit"""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(lambda: chrome_options(headless=True), size=MAX_SESSIONS)
+            atexit.register(_browser_pool.close)
+        return _browser_pool
+
+def scrape_forex_factory(pool=None):
+    """
+    Scrapes economic events from ForexFactory for the current month into event_cache.
+    Rows already cached are matched by data-event-id and only new or changed ones are
+    parsed; see event_cache.get_changes() for what changed. The page is loaded in a
+    session borrowed from the browser pool (default: get_browser_pool()).
+    Returns True if successful, False otherwise.
+    """
+    pool = pool or get_browser_pool()
     try:
-        print("Initializing Chrome driver...")
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        
         now = datetime.now()
-        month_abbr = now.strftime("%b").lower()  # e.g., 'feb'
         year = now.year
-        url = f"https://www.forexfactory.com/calendar?month={month_abbr}.{year}"
-        print(f"\nScraping calendar: {url}")
-        
-        driver.get(url)
-        
-        # Simulated scrolling using PAGE_DOWN keys to mimic user scrolling
-        body = driver.find_element(By.TAG_NAME, "body")
-        prev_scroll = 0
-        while True:
-            body.send_keys(Keys.PAGE_DOWN)
-            time.sleep(2)  # allow content to load
-            curr_scroll = driver.execute_script("return window.pageYOffset;")
-            if curr_scroll == prev_scroll:
-                break
-            prev_scroll = curr_scroll
-        
-        # Wait until the calendar table is loaded
-        wait = WebDriverWait(driver, 10)
-        calendar_table = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "calendar__table")))
-        # Uncomment below to inspect full HTML if needed:
-        # print(calendar_table.get_attribute("outerHTML"))
-
-        month_data = {}
-        current_date = None
-        
-        rows = calendar_table.find_elements(By.TAG_NAME, "tr")
-        for row in rows:
-            classes = row.get_attribute("class").split()
-            
-            # Process date rows
-            if "calendar__row--day-breaker" in classes:
-                try:
-                    td = row.find_element(By.TAG_NAME, "td")
-                    td_text = td.get_attribute("textContent").strip()  # e.g., "Thu Feb 6"
-                    print("Day-breaker td text:", td_text)
-                    match = re.search(r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2}", td_text, re.IGNORECASE)
-                    if match:
-                        date_str = match.group(0)  # e.g., "Feb 6"
-                        current_date = datetime.strptime(f"{date_str} {year}", "%b %d %Y").strftime("%Y-%m-%d")
-                        month_data[current_date] = []
-                        print(f"\nFound new date: {current_date}")
-                    else:
-                        print("No valid date found in day-breaker row from td text.")
-                except Exception as e:
-                    print("Error processing date row:", e)
-                continue  # Skip processing the day-breaker row
-
-            # Process event rows (only if current_date is set)
-            if current_date and row.get_attribute("data-event-id"):
-                try:
-                    event = {}
-                    
-                    # Extract time
-                    try:
-                        time_cell = row.find_element(By.CLASS_NAME, "calendar__time")
-                        time_divs = time_cell.find_elements(By.TAG_NAME, "div")
-                        if time_divs:
-                            time_text = time_divs[0].text.strip()
-                        else:
-                            time_text = time_cell.text.strip()
-                        event['time'] = time_text if time_text else "All Day"
-                    except Exception:
-                        event['time'] = "All Day"
-
-                    # Extract currency
-                    try:
-                        currency_cell = row.find_element(By.CLASS_NAME, "calendar__currency")
-                        event['currency'] = currency_cell.text.strip()
-                    except Exception:
-                        event['currency'] = ""
-
-                    # Extract event name (using your simplify_event_name function)
-                    try:
-                        event_cell = row.find_element(By.CLASS_NAME, "calendar__event")
-                        titles = event_cell.find_elements(By.CLASS_NAME, "calendar__event-title")
-                        if titles:
-                            event_name = titles[0].text.strip()
-                        else:
-                            event_name = event_cell.text.strip()
-                        event['event'] = simplify_event_name(event_name)
-                    except Exception:
-                        event['event'] = ""
-                    
-                    # Extract importance
-                    try:
-                        impact_cell = row.find_element(By.CLASS_NAME, "calendar__impact")
-                        icons = impact_cell.find_elements(By.TAG_NAME, "span")
-                        if icons:
-                            impact_class = icons[0].get_attribute("class")
-                        else:
-                            impact_class = impact_cell.text.strip()
-                        if "ff-impact-red" in impact_class:
-                            event['importance'] = "High"
-                        elif "ff-impact-ora" in impact_class:
-                            event['importance'] = "Medium"
-                        elif "ff-impact-yel" in impact_class:
-                            event['importance'] = "Low"
-                        else:
-                            event['importance'] = "Non-Economic"
-                    except Exception:
-                        event['importance'] = "Unknown"
-
-                    month_data[current_date].append(event)
-                    print(f"Added event on {current_date}: {event}")
-                except Exception as e:
-                    print(f"Error processing event row: {e}")
-                    continue
-            elif row.get_attribute("data-event-id"):
-                print("Event row encountered before any valid date was set.")
-                    
-        print(f"\nTotal dates processed: {len(month_data)}")
-        # Update the cache with the new data.
-        event_cache.month_data = month_data
+        with pool.session() as driver:
+            html, complete = load_month_page(driver, year, now.month)
+
+        # Split the rendered page into rows and only parse the ones that changed since the last run
+        days, rows, changes = store_month_page('current_month', html, year, now.month, complete)
+        event_cache.set_last_scrape_time(datetime.now())
+        print(f"\nTotal dates processed: {len(days)}, events: {len(rows)}, changes: {count_changes(changes) or 'none'}")
         return True
 
     except Exception as e:
@@ -214,8 +170,71 @@ def scrape_forex_factory():
         import traceback
         traceback.print_exc()
         return False
-    finally:
+
+def scrape_forex_months(buckets=MONTH_BUCKETS, max_sessions=MAX_SESSIONS, pool=None):
+    """
+    Scrape several calendar months at once, each in its own pooled browser session
+
+    Months load in parallel across at most max_sessions browsers, so a three-month
+    window takes about as long as the slowest month. A month that fails leaves its
+    bucket as it was and doesn't stop the others.
+
+    Args:
+        buckets (Iterable[tuple]): (cache bucket, month offset from this month) pairs
+            (default: previous, current and next month)
+        max_sessions (int): Browser sessions running at once, capped by the pool size (default: MAX_SESSIONS)
+        pool (BrowserPool): Pool to borrow sessions from (default: get_browser_pool())
+
+    Returns:
+        dict: Per bucket, the month ('oct.2025'), seconds taken, events, change counts
+        and the error message if it failed (None otherwise)
+    """
+    buckets = list(buckets)
+    today = date.today()
+    started = time.monotonic()
+    pool = pool or get_browser_pool()
+    try:
+        pool.driver_path()  # Resolve the driver once here rather than in whichever session launches first
+        driver_error = None
+    except Exception as e:
+        print(f"Error resolving chromedriver: {e}")
+        driver_error = str(e) or type(e).__name__
+    store_lock = threading.Lock()
+
+    def scrape(month_key, year, month):
+        month_started = time.monotonic()
+        result = {'month': month_label(year, month), 'events': 0, 'changes': {}, 'error': None}
         try:
-            driver.quit()
-        except Exception:
-            pass
+            with pool.session() as driver:
+                html, complete = load_month_page(driver, year, month)
+            with store_lock:
+                _, rows, changes = store_month_page(month_key, html, year, month, complete)
+            result.update(events=len(rows), changes=count_changes(changes))
+        except Exception as e:
+            print(f"Error scraping {result['month']}: {e}")
+            result['error'] = str(e) or type(e).__name__
+        result['seconds'] = time.monotonic() - month_started
+        return result
+
+    report = {}
+    if driver_error is not None:
+        # No session can start without a driver, so every month fails the same way
+        for month_key, offset in buckets:
+            report[month_key] = {'month': month_label(*shift_month(today, offset)), 'events': 0,
+                                 'changes': {}, 'error': driver_error, 'seconds': 0.0}
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_sessions, pool.size, len(buckets)))) as executor:
+            futures = {executor.submit(scrape, month_key, *shift_month(today, offset)): month_key
+                       for month_key, offset in buckets}
+            for future in as_completed(futures):
+                report[futures[future]] = future.result()
+
+    if any(result['error'] is None for result in report.values()):
+        event_cache.set_last_scrape_time(datetime.now())
+    print(f"\nScraped {len(report)} months in {time.monotonic() - started:.1f}s")
+    for month_key, _ in buckets:
+        result = report[month_key]
+        status = f"failed: {result['error']}" if result['error'] else \
+            f"{result['events']} events, changes: {result['changes'] or 'none'}"
+        print(f"  {month_key:<15} {result['month']:<9} {result['seconds']:>5.1f}s  {status}")
+    return report
@@ -11,3 +11,11 @@ def get_member(guild: discord.Guild, member_id: Union[int, str]) -> discord.Memb
 def format_message(message: str) -> str:
     """Helper function to format messages"""
     return message.strip()
+
+def format_bytes(size: float) -> str:
+    """Helper function to format a byte count for display"""
+    for unit in ["B", "KB", "MB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
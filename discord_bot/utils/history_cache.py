@@ -0,0 +1,48 @@
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+
+from utils.bar_store import DateRange, merge_ranges, missing_ranges
+
+class HistoryWindow:
+    def __init__(self, bars: Optional[pd.DataFrame] = None, ranges: Optional[List[DateRange]] = None):
+        """
+        Daily bars held in memory for one ticker, with the date ranges they cover
+
+        Args:
+            bars (Optional[pd.DataFrame]): Bars indexed by date
+            ranges (Optional[List[DateRange]]): Merged inclusive date ranges already fetched
+        """
+        self.bars = bars if bars is not None else pd.DataFrame()
+        self.ranges = ranges or []
+
+    def covers(self, start: date, end: date) -> bool:
+        """Whether the window can answer start..end by slicing"""
+        return not missing_ranges(self.ranges, start, end)
+
+    def slice(self, start: date, end: date) -> pd.DataFrame:
+        """Bars for the inclusive range start..end"""
+        if self.bars.empty:
+            return self.bars
+        return self.bars.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+    def merge(self, start: date, end: date, bars: pd.DataFrame) -> 'HistoryWindow':
+        """
+        Combine newly fetched bars with this window
+
+        Args:
+            start (date): First date of the fetched range
+            end (date): Last date of the fetched range
+            bars (pd.DataFrame): Fetched bars indexed by date
+
+        Returns:
+            HistoryWindow: New window; overlapping dates take the newly fetched values
+        """
+        combined = pd.concat([self.bars, bars]) if not self.bars.empty else bars
+        combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        return HistoryWindow(combined, merge_ranges(self.ranges + [(start, end)]))
+
+    def memory_usage(self, deep: bool = True) -> int:
+        """Size of the held bars in bytes, used by the cache's byte budget"""
+        return int(self.bars.memory_usage(deep=deep).sum())
@@ -0,0 +1,216 @@
+import math
+from collections import deque
+from datetime import date
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from utils.indicators import fib_retracements
+
+class RollingMean:
+    def __init__(self, window: int):
+        """
+        Mean of the last `window` values, updated in constant time per value
+
+        Args:
+            window (int): Number of values averaged
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.total = 0.0
+        self._since_resum = 0
+
+    def push(self, value: float) -> None:
+        self.values.append(value)
+        self.total += value
+        if len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        # Re-add from scratch once per window so float error can't build up; amortized O(1)
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self.total = math.fsum(self.values)
+            self._since_resum = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current mean, None until a full window has been pushed"""
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+    def peek(self, value: float) -> Optional[float]:
+        """Mean as if value were pushed, without pushing it"""
+        if len(self.values) < self.window - 1:
+            return None
+        dropped = self.values[0] if len(self.values) == self.window else 0.0
+        return (self.total - dropped + value) / self.window
+
+class RollingExtreme:
+    def __init__(self, window: int, maximum: bool = True):
+        """
+        Maximum (or minimum) of the last `window` values, kept in a monotonic deque
+
+        Each value enters and leaves the deque once, so updates are amortized O(1)
+        and the current extreme is always at the front.
+
+        Args:
+            window (int): Number of values covered
+            maximum (bool): Track the maximum, or the minimum if False (default: True)
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.maximum = maximum
+        self.count = 0
+        # (position, value) pairs, values decreasing for a maximum and increasing for a minimum
+        self.candidates: Deque[Tuple[int, float]] = deque()
+
+    def _beats(self, a: float, b: float) -> bool:
+        return a >= b if self.maximum else a <= b
+
+    def push(self, value: float) -> None:
+        while self.candidates and self._beats(value, self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        if self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current extreme, None until a full window has been pushed"""
+        if self.count < self.window:
+            return None
+        return self.candidates[0][1]
+
+    def peek(self, value: float) -> Optional[float]:
+        """Extreme as if value were pushed, without pushing it"""
+        if self.count < self.window - 1:
+            return None
+        # The oldest position in the window would drop out; the deque is ordered, so
+        # the best remaining candidate is whichever comes next
+        best = self.candidates[0] if self.candidates else None
+        if best is not None and best[0] <= self.count - self.window:
+            best = self.candidates[1] if len(self.candidates) > 1 else None
+        if best is None or self._beats(value, best[1]):
+            return value
+        return best[1]
+
+class IndicatorState:
+    def __init__(self, sma_windows: Iterable[int] = (10, 50), range_window: int = 60,
+                 levels: Iterable[float] = (0.7, 0.786)):
+        """
+        Streaming moving averages, high/low range and Fibonacci levels for one ticker
+
+        Closed bars are appended in constant time; a forming intraday bar can be
+        previewed against the closed ones without changing the state.
+
+        Args:
+            sma_windows (Iterable[int]): Simple moving average lengths (default: 10 and 50)
+            range_window (int): Bars in the high/low range used for the levels (default: 60)
+            levels (Iterable[float]): Fibonacci retracement ratios (default: 0.7 and 0.786)
+        """
+        self.sma_windows = tuple(sma_windows)
+        self.range_window = range_window
+        self.levels = tuple(levels)
+        self.smas = {window: RollingMean(window) for window in self.sma_windows}
+        self.high = RollingExtreme(range_window, maximum=True)
+        self.low = RollingExtreme(range_window, maximum=False)
+        self.last_date: Optional[date] = None
+        # Enough recent bars to rebuild the state in to_dict/from_dict
+        self.history_length = max(self.sma_windows + (range_window,))
+        self.recent: Deque[Tuple[float, float, float]] = deque(maxlen=self.history_length)
+
+    def append(self, high: float, low: float, close: float, bar_date: Optional[date] = None) -> None:
+        """
+        Add a closed bar
+
+        Args:
+            high (float): Bar high
+            low (float): Bar low
+            close (float): Bar close
+            bar_date (Optional[date]): Bar date; bars dated on or before the last one are ignored
+        """
+        if bar_date is not None and self.last_date is not None and bar_date <= self.last_date:
+            return
+        for sma in self.smas.values():
+            sma.push(close)
+        self.high.push(high)
+        self.low.push(low)
+        self.recent.append((high, low, close))
+        if bar_date is not None:
+            self.last_date = bar_date
+
+    def _values(self, smas: Dict[int, Optional[float]], top: Optional[float],
+                bottom: Optional[float]) -> Dict[str, Optional[float]]:
+        values: Dict[str, Optional[float]] = {f'SMA_{window}': smas[window] for window in self.sma_windows}
+        values[f'High_{self.range_window}'] = top
+        values[f'Low_{self.range_window}'] = bottom
+        fibs = fib_retracements(top, bottom, self.levels) if top is not None and bottom is not None else {}
+        for level in self.levels:
+            values[f'Fib_{level}'] = fibs.get(level)
+        return values
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """
+        Indicators over the closed bars, named like compute_indicators' output
+
+        Returns:
+            Dict[str, Optional[float]]: Value per indicator, None until its window is full
+        """
+        return self._values({window: sma.value for window, sma in self.smas.items()},
+                            self.high.value, self.low.value)
+
+    def preview(self, high: float, low: float, close: float) -> Dict[str, Optional[float]]:
+        """
+        Indicators including a forming bar that hasn't closed yet
+
+        Args:
+            high (float): Forming bar's high so far
+            low (float): Forming bar's low so far
+            close (float): Forming bar's latest price
+
+        Returns:
+            Dict[str, Optional[float]]: Value per indicator, None until its window is full
+        """
+        return self._values({window: sma.peek(close) for window, sma in self.smas.items()},
+                            self.high.peek(high), self.low.peek(low))
+
+    @classmethod
+    def from_frame(cls, bars: pd.DataFrame, **kwargs) -> 'IndicatorState':
+        """
+        Seed a state from daily bars
+
+        Args:
+            bars (pd.DataFrame): Bars with High, Low and Close columns indexed by date, oldest first
+            **kwargs: Indicator parameters passed to IndicatorState
+
+        Returns:
+            IndicatorState: State after the last bar
+        """
+        state = cls(**kwargs)
+        tail = bars.tail(state.history_length)
+        for timestamp, high, low, close in zip(tail.index, tail['High'], tail['Low'], tail['Close']):
+            state.append(float(high), float(low), float(close), pd.Timestamp(timestamp).date())
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot of the state"""
+        return {
+            'sma_windows': list(self.sma_windows),
+            'range_window': self.range_window,
+            'levels': list(self.levels),
+            'last_date': self.last_date.isoformat() if self.last_date else None,
+            'recent': [list(bar) for bar in self.recent],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorState':
+        """Rebuild a state saved with to_dict"""
+        state = cls(data['sma_windows'], data['range_window'], data['levels'])
+        for high, low, close in data['recent']:
+            state.append(high, low, close)
+        state.last_date = date.fromisoformat(data['last_date']) if data['last_date'] else None
+        return state
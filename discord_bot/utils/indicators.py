@@ -0,0 +1,176 @@
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling mean down the first axis, computed for every column at once from cumulative sums
+
+    Args:
+        values (np.ndarray): Dates x tickers array (or a single 1-D series), NaN where missing
+        window (int): Number of rows in each window
+
+    Returns:
+        np.ndarray: Same shape as values; NaN until a full window without gaps is available,
+        matching pandas' rolling(window).mean()
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+
+    sums = np.zeros((len(values) + 1,) + values.shape[1:])
+    missing = np.isnan(values)
+    if not missing.any():
+        np.cumsum(values, axis=0, out=sums[1:])
+        out[window - 1:] = (sums[window:] - sums[:-window]) / window
+        return out
+
+    # Gaps: sum with NaN as zero, and blank out any window that contained one
+    np.cumsum(np.where(missing, 0.0, values), axis=0, out=sums[1:])
+    gaps = np.zeros(sums.shape)
+    np.cumsum(missing, axis=0, out=gaps[1:])
+    window_sums = (sums[window:] - sums[:-window]) / window
+    out[window - 1:] = np.where(gaps[window:] - gaps[:-window] > 0, np.nan, window_sums)
+    return out
+
+def _rolling_extreme(values: np.ndarray, window: int, ufunc: np.ufunc) -> np.ndarray:
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    values = np.asarray(values, dtype=float)
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+
+    # Doubling: after each step acc[i] reduces values[i:i + span], so a window takes
+    # about log2(window) whole-array passes instead of one pass per element.
+    # NaN propagates through np.maximum/np.minimum, matching pandas.
+    acc, span = values, 1
+    while span * 2 <= window:
+        acc = ufunc(acc[:-span], acc[span:])
+        span *= 2
+    remainder = window - span
+    if remainder:
+        acc = ufunc(acc[:-remainder], acc[remainder:])
+    out[window - 1:] = acc
+    return out
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum down the first axis for every column at once; NaN until a full window"""
+    return _rolling_extreme(values, window, np.maximum)
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling minimum down the first axis for every column at once; NaN until a full window"""
+    return _rolling_extreme(values, window, np.minimum)
+
+def fib_levels(high: np.ndarray, low: np.ndarray, window: int,
+               levels: Iterable[float]) -> Dict[float, np.ndarray]:
+    """
+    Fibonacci retracement levels over the rolling high/low range
+
+    Args:
+        high (np.ndarray): Dates x tickers highs
+        low (np.ndarray): Dates x tickers lows
+        window (int): Rows in the high/low range
+        levels (Iterable[float]): Retracement ratios, e.g. (0.7, 0.786)
+
+    Returns:
+        Dict[float, np.ndarray]: Price array for each level, shaped like high
+    """
+    return fib_retracements(rolling_max(high, window), rolling_min(low, window), levels)
+
+def fib_retracements(top: np.ndarray, bottom: np.ndarray, levels: Iterable[float]) -> Dict[float, np.ndarray]:
+    """Fibonacci retracement levels for an already computed high/low range"""
+    span = top - bottom
+    return {level: top - span * level for level in levels}
+
+class PricePanel:
+    def __init__(self, dates: pd.DatetimeIndex, tickers: Sequence[str], fields: Mapping[str, np.ndarray]):
+        """
+        Daily bars for many tickers as dates x tickers arrays, one per OHLCV field
+
+        Args:
+            dates (pd.DatetimeIndex): Row labels, oldest first
+            tickers (Sequence[str]): Column labels
+            fields (Mapping[str, np.ndarray]): Array per field, NaN where a ticker has no bar
+        """
+        self.dates = dates
+        self.tickers: List[str] = list(tickers)
+        self.fields = dict(fields)
+
+    @classmethod
+    def from_frames(cls, frames: Mapping[str, pd.DataFrame]) -> 'PricePanel':
+        """
+        Align per-ticker bar DataFrames on the union of their dates
+
+        Args:
+            frames (Mapping[str, pd.DataFrame]): OHLCV bars indexed by date, per ticker
+
+        Returns:
+            PricePanel: Panel with a column per ticker, in the mapping's order
+        """
+        normalized = {}
+        for ticker, df in frames.items():
+            index = pd.DatetimeIndex(df.index)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            normalized[ticker] = df.set_axis(index.normalize())
+
+        dates = pd.DatetimeIndex(sorted(set().union(*(df.index for df in normalized.values()))))
+        fields = {}
+        for field in PANEL_FIELDS:
+            columns = [df[field].reindex(dates).to_numpy(dtype=float) if field in df
+                       else np.full(len(dates), np.nan) for df in normalized.values()]
+            fields[field] = np.column_stack(columns) if columns else np.empty((len(dates), 0))
+        return cls(dates, list(normalized), fields)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.fields[field]
+
+    def to_frame(self, values: np.ndarray) -> pd.DataFrame:
+        """Label a dates x tickers array with the panel's dates and tickers"""
+        return pd.DataFrame(values, index=self.dates, columns=self.tickers)
+
+def compute_indicators(panel: PricePanel, sma_windows: Iterable[int] = (10, 50),
+                       range_window: int = 60, levels: Iterable[float] = (0.7, 0.786)) -> Dict[str, np.ndarray]:
+    """
+    Moving averages, high/low range and Fibonacci levels for every ticker in a panel
+
+    Args:
+        panel (PricePanel): Bars for the ticker universe
+        sma_windows (Iterable[int]): Simple moving average lengths (default: 10 and 50)
+        range_window (int): Rows in the high/low range used for the levels (default: 60)
+        levels (Iterable[float]): Fibonacci retracement ratios (default: 0.7 and 0.786)
+
+    Returns:
+        Dict[str, np.ndarray]: Dates x tickers array per indicator, named like
+        SMA_10, High_60, Low_60 and Fib_0.786
+    """
+    close, high, low = panel['Close'], panel['High'], panel['Low']
+    indicators = {f'SMA_{window}': rolling_mean(close, window) for window in sma_windows}
+    top = indicators[f'High_{range_window}'] = rolling_max(high, range_window)
+    bottom = indicators[f'Low_{range_window}'] = rolling_min(low, range_window)
+    for level, values in fib_retracements(top, bottom, levels).items():
+        indicators[f'Fib_{level}'] = values
+    return indicators
+
+def latest_values(panel: PricePanel, indicators: Mapping[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Latest row of each indicator as a tickers x indicators table, for reports and screens
+
+    Args:
+        panel (PricePanel): Panel the indicators were computed from
+        indicators (Mapping[str, np.ndarray]): Output of compute_indicators
+
+    Returns:
+        pd.DataFrame: One row per ticker, with the last close alongside the indicators
+    """
+    columns = {'Close': panel['Close'][-1] if len(panel.dates) else np.full(len(panel.tickers), np.nan)}
+    for name, values in indicators.items():
+        columns[name] = values[-1] if len(values) else np.full(len(panel.tickers), np.nan)
+    return pd.DataFrame(columns, index=panel.tickers)
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import os
+import pathlib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utils.bar_store import BarStore
+from utils.history_cache import HistoryWindow
+from utils.rate_limiting import RateLimitedCache
+
+SNAPSHOT_FIELDS = {'price': 'Close', 'high': 'High', 'low': 'Low', 'volume': 'Volume'}
+DEFAULT_NAMES_PATH = pathlib.Path(__file__).parent.parent / 'data' / 'company_names.json'
+
+class QuoteService:
+    def __init__(self, cache: RateLimitedCache, max_workers: int = 4,
+                 bar_store: Optional[BarStore] = None, names_path: pathlib.Path = DEFAULT_NAMES_PATH):
+        """
+        Fetch market data without blocking the event loop
+
+        Args:
+            cache (RateLimitedCache): Cache used to store results and throttle upstream calls
+            max_workers (int): Maximum number of concurrent upstream fetches (default: 4)
+            bar_store (Optional[BarStore]): Local store for daily bars (default: data/bars)
+            names_path (pathlib.Path): File company names are saved in (default: data/company_names.json)
+        """
+        self.cache = cache
+        self.bars = bar_store or BarStore()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quotes")
+
+        # Columnar quote table for the ticker universe, indexed by ticker
+        self.snapshot = pd.DataFrame(columns=list(SNAPSHOT_FIELDS))
+        self.snapshot_time = 0.0
+        # Company names seen in single-ticker fetches; bulk downloads don't include them,
+        # so they're saved to disk and each ticker's name is only fetched once
+        self.names_path = pathlib.Path(names_path)
+        self._names: Dict[str, str] = self._load_names()
+        self._names_lock = threading.Lock()
+
+    async def _run(self, func: Callable, *args) -> Any:
+        """Wait for the throttle, then run a blocking upstream call in the worker pool"""
+        await self.cache.throttle_async()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _load_names(self) -> Dict[str, str]:
+        try:
+            with open(self.names_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _remember_name(self, ticker: str, name: str) -> None:
+        """Record a company name and save the name map if it changed"""
+        # Held through the write so worker threads don't share the temp file
+        with self._names_lock:
+            if self._names.get(ticker) == name:
+                return
+            self._names[ticker] = name
+            try:
+                self.names_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.names_path.with_suffix('.json.tmp')
+                with open(tmp, 'w') as f:
+                    json.dump(self._names, f, indent=4, sort_keys=True)
+                os.replace(tmp, self.names_path)
+            except OSError as e:
+                print(f"Error saving company names: {e}")
+
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        """Blocking fetch of the quote fields used by the bot"""
+        # yfinance is imported on first fetch so loading the cogs stays fast
+        import yfinance as yf
+        info = yf.Ticker(ticker).info
+        name = info.get('shortName', ticker.upper())
+        self._remember_name(ticker.upper(), name)
+        return {
+            'price': info.get('regularMarketPrice'),
+            'high': info.get('dayHigh'),
+            'low': info.get('dayLow'),
+            'volume': info.get('volume'),
+            'name': name
+        }
+
+    @staticmethod
+    def _download_quotes(tickers: List[str]) -> pd.DataFrame:
+        """Blocking bulk download of the latest daily bar for many tickers in one request"""
+        import yfinance as yf
+        data = yf.download(tickers, period="5d", interval="1d", group_by="column",
+                           auto_adjust=False, progress=False, threads=True)
+        if data.empty:
+            return pd.DataFrame(columns=list(SNAPSHOT_FIELDS))
+        if not isinstance(data.columns, pd.MultiIndex):
+            data.columns = pd.MultiIndex.from_product([data.columns, tickers])
+
+        # Last known value per ticker for each field, laid out as one column per field
+        snapshot = pd.DataFrame({
+            field: data[column].ffill().iloc[-1]
+            for field, column in SNAPSHOT_FIELDS.items()
+        })
+        snapshot.index = snapshot.index.str.upper()
+        return snapshot.dropna(subset=['price'])
+
+    def _snapshot_quote(self, ticker: str, snapshot: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """Build a quote dict from a row of a snapshot table"""
+        ticker = ticker.upper()
+        if ticker not in snapshot.index:
+            return None
+        row = snapshot.loc[ticker]
+        return {
+            'price': float(row['price']),
+            'high': float(row['high']) if pd.notna(row['high']) else None,
+            'low': float(row['low']) if pd.notna(row['low']) else None,
+            'volume': int(row['volume']) if pd.notna(row['volume']) else None,
+            'name': self._names.get(ticker, ticker)
+        }
+
+    def _snapshot_is_fresh(self) -> bool:
+        return time.time() - self.snapshot_time < self.cache.cache_ttl
+
+    async def refresh_snapshot(self, tickers: Iterable[str]) -> pd.DataFrame:
+        """
+        Refresh the universe snapshot with a single bulk download
+
+        Args:
+            tickers (Iterable[str]): Ticker universe to download
+
+        Returns:
+            pd.DataFrame: New snapshot indexed by ticker
+        """
+        snapshot = await self._run(self._download_quotes, sorted(t.upper() for t in tickers))
+        self.snapshot = snapshot
+        self.snapshot_time = time.time()
+        return snapshot
+
+    async def get_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Get quote info with caching and rate limiting
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            Optional[Dict[str, Any]]: Quote info, None if the fetch failed
+        """
+        # Until a ticker's company name is known, go through the info path, which fetches it
+        if self._snapshot_is_fresh() and ticker.upper() in self._names:
+            info = self._snapshot_quote(ticker, self.snapshot)
+            if info is not None:
+                return info
+
+        key = f"quote:{ticker.upper()}"
+        try:
+            return await self.cache.get_or_load(key, lambda: self._run(self._fetch_info, ticker),
+                                                stale_while_revalidate=True)
+        except Exception as e:
+            print(f"Error fetching {ticker}: {str(e)}")
+            return None
+
+    async def refresh_quote(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a quote and replace the cached one, even if it hasn't expired
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            Optional[Dict[str, Any]]: Quote info, None if the fetch failed
+        """
+        key = f"quote:{ticker.upper()}"
+        try:
+            return await self.cache.load(key, lambda: self._run(self._fetch_info, ticker))
+        except Exception as e:
+            print(f"Error refreshing {ticker}: {str(e)}")
+            return None
+
+    def quote_age(self, ticker: str) -> Optional[float]:
+        """
+        Seconds since the quote get_quote would serve for a ticker was fetched
+
+        Args:
+            ticker (str): Ticker symbol
+
+        Returns:
+            Optional[float]: Age of the quote, None if no quote is held
+        """
+        if self._snapshot_is_fresh() and ticker.upper() in self.snapshot.index and ticker.upper() in self._names:
+            return time.time() - self.snapshot_time
+        return self.cache.age(f"quote:{ticker.upper()}")
+
+    async def get_quotes(self, tickers: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get quote info for several tickers, downloading all misses in one request
+
+        Args:
+            tickers (Iterable[str]): Ticker symbols
+
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Quote info per upper-cased ticker,
+            None for tickers that couldn't be fetched
+        """
+        quotes = {}
+        missing = []
+        for ticker in dict.fromkeys(t.upper() for t in tickers):
+            info = self._snapshot_quote(ticker, self.snapshot) if self._snapshot_is_fresh() else None
+            if info is None:
+                info = self.cache.get(f"quote:{ticker}")
+            quotes[ticker] = info
+            if info is None:
+                missing.append(ticker)
+
+        if missing:
+            try:
+                downloaded = await self._run(self._download_quotes, missing)
+            except Exception as e:
+                print(f"Error fetching {', '.join(missing)}: {str(e)}")
+                return quotes
+            for ticker in missing:
+                info = self._snapshot_quote(ticker, downloaded)
+                # get_quote serves quote: entries as they are, so only cache ones that carry the company name
+                if info is not None and ticker in self._names:
+                    self.cache.set(f"quote:{ticker}", info)
+                quotes[ticker] = info
+
+        return quotes
+
+    async def get_history(self, ticker: str, days: int) -> pd.DataFrame:
+        """
+        Get daily price history with caching and rate limiting. Each ticker has
+        one cached window, so shorter requests are sliced from longer ones.
+
+        Args:
+            ticker (str): Ticker symbol
+            days (int): Number of days of history
+
+        Returns:
+            pd.DataFrame: Daily OHLCV bars indexed by date
+        """
+        key = f"history:{ticker.upper()}"
+        end = datetime.now().date()
+        start = end - timedelta(days=days)
+
+        # One hit or miss per request, by whether the cached window already covers it
+        window = self.cache.peek(key)
+        self.cache.stats.record(key, 'hits' if window is not None and window.covers(start, end) else 'misses')
+
+        # A shared in-flight load may be for a different window of the same
+        # ticker, so retry a couple of times until the window covers ours
+        for attempt in range(3):
+            if attempt:
+                window = self.cache.peek(key)
+            if window is not None and window.covers(start, end):
+                break
+            window = await self.cache.load(key, lambda: self._load_history(ticker, start, end))
+            if window.covers(start, end):
+                break
+        return window.slice(start, end)
+
+    async def _load_history(self, ticker: str, start: date, end: date) -> HistoryWindow:
+        """Read bars from the bar store and merge them into the ticker's cached window"""
+        if self.bars.covers(ticker, start, end):
+            loop = asyncio.get_running_loop()
+            bars = await loop.run_in_executor(self._executor, self.bars.get_bars, ticker, start, end)
+        else:
+            bars = await self._run(self.bars.get_bars, ticker, start, end)
+
+        window = self.cache.peek(f"history:{ticker.upper()}") or HistoryWindow()
+        return window.merge(start, end, bars)
+
+    def close(self) -> None:
+        """Stop the worker pool, dropping any fetches that haven't started"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,27 +1,63 @@
+import asyncio
+import sys
 import time
-from typing import Any, Dict, Tuple, Optional
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple, Optional
+
+from utils.cache_stats import CacheStats, key_family
+
+def estimate_size(value: Any) -> int:
+    """Rough size of a cached value in bytes"""
+    # pandas objects report their real footprint, including object columns
+    if hasattr(value, 'memory_usage'):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
 
 class RateLimitedCache:
-    def __init__(self, cache_ttl: int = 300, min_delay: float = 2.0):
+    def __init__(self, cache_ttl: int = 300, min_delay: float = 2.0,
+                 max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 max_stale: int = 0):
         """
-        Initialize a rate-limited cache
+        Initialize a rate-limited cache with LRU eviction
         
         Args:
             cache_ttl (int): Time to live for cached items in seconds (default: 300s/5min)
             min_delay (float): Minimum delay between operations in seconds (default: 2.0s)
+            max_entries (int): Maximum number of cached items (default: 1024)
+            max_bytes (int): Maximum estimated size of all cached items in bytes (default: 64MB)
+            max_stale (int): How long past its TTL an item may still be served while it is
+                refreshed in the background; items are dropped after cache_ttl + max_stale (default: 0)
         """
-        self.cache: Dict[str, Tuple[float, Any]] = {}
+        # Ordered from least to most recently used
+        self.cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
         self.cache_ttl = cache_ttl
+        self.max_stale = max_stale
         self.last_request = 0
         self.min_delay = min_delay
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._sizes: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self.stats = CacheStats()
 
-    def _throttle(self) -> None:
-        """Enforce minimum delay between operations"""
+    async def throttle_async(self) -> None:
+        """Enforce minimum delay between operations without blocking the event loop"""
         now = time.time()
-        time_passed = now - self.last_request
-        if time_passed < self.min_delay:
-            time.sleep(self.min_delay - time_passed)
-        self.last_request = time.time()
+        wait = self.last_request + self.min_delay - now
+        # Reserve the next slot before sleeping so concurrent callers queue up behind it
+        self.last_request = now + max(wait, 0)
+        if wait > 0:
+            self.stats.throttle_wait += wait
+            await asyncio.sleep(wait)
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -30,6 +66,20 @@ class RateLimitedCache:
         Args:
             key (str): Cache key to lookup
             
+        Returns:
+            Optional[Any]: Cached value if valid, None if expired or missing
+        """
+        cached_data = self.peek(key)
+        self.stats.record(key, 'hits' if cached_data is not None else 'misses')
+        return cached_data
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        get() without recording a hit or miss, for callers that decide the outcome themselves
+
+        Args:
+            key (str): Cache key to lookup
+
         Returns:
             Optional[Any]: Cached value if valid, None if expired or missing
         """
@@ -37,29 +87,203 @@ class RateLimitedCache:
         if key in self.cache:
             cached_time, cached_data = self.cache[key]
             if now - cached_time < self.cache_ttl:
+                self.cache.move_to_end(key)
                 return cached_data
+            if now - cached_time >= self.cache_ttl + self.max_stale:
+                self._remove(key, reason='expirations')
+        return None
+
+    def age(self, key: str) -> Optional[float]:
+        """
+        Seconds since an item was stored
+        
+        Args:
+            key (str): Cache key to lookup
+            
+        Returns:
+            Optional[float]: Age of the item, None if it isn't cached
+        """
+        if key in self.cache:
+            return time.time() - self.cache[key][0]
         return None
 
     def set(self, key: str, value: Any) -> None:
         """
-        Store item in cache with current timestamp
+        Store item in cache with current timestamp, evicting the least
+        recently used items if the cache grows past its limits
         
         Args:
             key (str): Cache key
             value (Any): Value to store
         """
-        self._throttle()
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # Never worth flushing the whole cache for one oversized value
+            self._remove(key)
+            return
+
+        self._remove(key)
         self.cache[key] = (time.time(), value)
+        self._sizes[key] = size
+        self.total_bytes += size
+
+        while len(self.cache) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self.cache))
+            self._remove(oldest_key, reason='evictions')
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an item from cache if present
+        
+        Args:
+            key (str): Cache key
+        """
+        self._remove(key, reason='invalidations')
+
+    def _remove(self, key: str, reason: Optional[str] = None) -> None:
+        """Drop an item and its size accounting if present, counting why if a reason is given"""
+        if self.cache.pop(key, None) is not None:
+            self.total_bytes -= self._sizes.pop(key, 0)
+            if reason:
+                self.stats.record(key, reason)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]],
+                          stale_while_revalidate: bool = False) -> Any:
+        """
+        Get item from cache, loading it on a miss. Concurrent misses on the
+        same key share a single in-flight load and all receive its result.
+        
+        Args:
+            key (str): Cache key
+            loader (Callable[[], Awaitable[Any]]): Coroutine function that fetches the value
+            stale_while_revalidate (bool): Serve an expired item immediately while it is
+                within max_stale, and refresh it in the background (default: False)
+            
+        Returns:
+            Any: Cached or freshly loaded value. Exceptions raised by the loader
+            are propagated to every waiting caller.
+        """
+        cached_data = self.peek(key)
+        if cached_data is not None:
+            self.stats.record(key, 'hits')
+            return cached_data
+
+        if stale_while_revalidate and key in self.cache:
+            # get() keeps items until cache_ttl + max_stale, so this one is stale but servable
+            self.stats.record(key, 'stale_hits')
+            if key not in self._inflight:
+                self._start_load(key, loader).add_done_callback(self._log_refresh_error)
+            self.cache.move_to_end(key)
+            return self.cache[key][1]
+
+        self.stats.record(key, 'misses')
+        return await self.load(key, loader)
+
+    async def load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Load and store an item regardless of what is cached, sharing the
+        in-flight load with concurrent callers for the same key
+        
+        Args:
+            key (str): Cache key
+            loader (Callable[[], Awaitable[Any]]): Coroutine function that fetches the value
+            
+        Returns:
+            Any: Freshly loaded value
+        """
+        # Shield the shared load so one cancelled caller doesn't cancel it for everyone
+        return await asyncio.shield(self._start_load(key, loader))
+
+    def _start_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Return the in-flight load for a key, starting one if there is none"""
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._load(key, loader))
+            self._inflight[key] = inflight
+        return inflight
+
+    @staticmethod
+    def _log_refresh_error(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            print(f"Error refreshing cached item: {str(future.exception())}")
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a loader and store its result, clearing the in-flight entry when done"""
+        started = time.perf_counter()
+        failed = True
+        try:
+            value = await loader()
+            failed = False
+            if value is not None:
+                self.set(key, value)
+            return value
+        finally:
+            self.stats.record_load(key, time.perf_counter() - started, failed=failed)
+            self._inflight.pop(key, None)
 
     def clear(self) -> None:
         """Clear all cached items"""
         self.cache.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
 
-    def remove_expired(self) -> None:
-        """Remove all expired items from cache"""
+    def remove_expired(self) -> int:
+        """
+        Remove all expired items from cache
+        
+        Returns:
+            int: Number of items removed
+        """
         now = time.time()
-        self.cache = {
-            key: (ts, val) 
-            for key, (ts, val) in self.cache.items() 
-            if now - ts < self.cache_ttl
-        } 
\ No newline at end of file
+        expired = [
+            key for key, (ts, _) in self.cache.items()
+            if now - ts >= self.cache_ttl + self.max_stale
+        ]
+        for key in expired:
+            self._remove(key, reason='expirations')
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Current size and counters, overall and per key family
+        
+        Returns:
+            Dict[str, Any]: entries, bytes, throttle_wait (seconds) and families, which maps
+            each key family to its counters plus its current entries and bytes
+        """
+        families = self.stats.snapshot(extra_families={key_family(key) for key in self.cache})
+        for key in self.cache:
+            family = families[key_family(key)]
+            family['entries'] += 1
+            family['bytes'] += self._sizes.get(key, 0)
+        return {
+            'entries': len(self.cache),
+            'bytes': self.total_bytes,
+            'throttle_wait': self.stats.throttle_wait,
+            'families': families,
+        }
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """
+        Start a background task that removes expired items on a schedule.
+        Must be called from a running event loop.
+        
+        Args:
+            interval (float): Seconds between sweeps (default: 60s)
+        """
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep(interval))
+
+    def stop_sweeper(self) -> None:
+        """Stop the background expiry task"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def _sweep(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.remove_expired()
+            except Exception as e:
+                print(f"Error sweeping cache: {str(e)}") 
\ No newline at end of file
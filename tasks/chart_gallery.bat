@@ -0,0 +1,6 @@
+cd C:\Users\Jiggy\code\financial_agents
+call .\venv\Scripts\activate
+cd discord_bot\scripts
+rem Mondays build the weekly report's gallery, like the report workflow
+for /f %%d in ('powershell -NoProfile -Command "(Get-Date).DayOfWeek"') do set DAY=%%d
+if "%DAY%"=="Monday" (python build_chart_gallery.py --weekly) else (python build_chart_gallery.py) 
\ No newline at end of file